@@ -5,13 +5,6 @@ import os
 import tempfile
 import uuid
 from datetime import datetime, timedelta
-from transformers import pipeline
-from reportlab.lib.pagesizes import letter
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Flowable
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.enums import TA_LEFT, TA_CENTER
-from reportlab.lib.units import inch
-from reportlab.lib.colors import HexColor
 import logging
 import re
 import smtplib
@@ -26,6 +19,13 @@ from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build
 from google.auth.transport.requests import Request
 
+from scheduler import FairScheduler, AdmissionError
+from search_index import SearchIndex
+from media_probe import get_audio_duration
+from model_tiers import ModelManager, DEFAULT_TIER, QUALITY_HINTS, TIER_ORDER, MODEL_TIERS
+from transcript_archive import TranscriptArchive
+from meeting_pipeline import analyze_audio, archive_transcript, create_bullet_points_pdf
+
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -36,6 +36,11 @@ CORS(app)  # Enable CORS for all routes
 # Global variables for models
 whisper_model = None
 summarizer = None
+default_tier = None
+model_manager = ModelManager()
+
+# Tiers loaded at startup besides the default; other tiers load on first use
+PRELOAD_TIERS = [tier for tier in os.environ.get('PRELOAD_TIERS', 'fast').split(',') if tier]
 
 # Google Calendar configuration
 SCOPES = ['https://www.googleapis.com/auth/calendar.events']
@@ -50,15 +55,38 @@ EMAIL_CONFIG = {
     'password': 'txqn jjou izcr ibzs',   # Your app password (not regular password)
     'name': 'Meet Summarizer'
 }
+EMAIL_PATTERN = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
 
 # Directories
 UPLOAD_DIR = "uploads"
 OUTPUT_DIR = "outputs"
+INDEX_DIR = "index"
+
+# Files served by /download; batch-indexed meetings keep theirs in the batch output tree
+OUTPUT_FILE_PATTERN = re.compile(r'^(?:meeting_summary|transcript)_(.+)\.(pdf|mta)$')
 
 # Create directories if they don't exist
 os.makedirs(UPLOAD_DIR, exist_ok=True)
 os.makedirs(OUTPUT_DIR, exist_ok=True)
 
+# Scheduler for transcription and summarization jobs
+scheduler = FairScheduler({
+    'workers': int(os.environ.get('SCHEDULER_WORKERS', 1)),
+    'max_running_per_tenant': int(os.environ.get('SCHEDULER_MAX_RUNNING_PER_USER', 1)),
+    'max_queued_per_tenant': int(os.environ.get('SCHEDULER_MAX_QUEUED_PER_USER', 10)),
+    'max_normal_wait': int(os.environ.get('SCHEDULER_MAX_NORMAL_WAIT', 900)),
+})
+
+# Only trust the X-User-Id header when a proxy in front of the app sets it;
+# otherwise any client could pick a new identity per request
+TRUST_USER_HEADER = os.environ.get('TRUST_USER_HEADER', 'false').lower() == 'true'
+
+# Search index over past meetings
+search_index = SearchIndex(
+    INDEX_DIR,
+    enable_vectors=os.environ.get('SEARCH_VECTORS', 'true').lower() != 'false'
+)
+
 
 @app.route('/')
 def index():
@@ -150,58 +178,58 @@ def send_email_with_pdf(recipient_email, pdf_path, meeting_title="Meeting Summar
         logger.error(f"Error sending email: {e}")
         return False
 
-@app.route('/send-email', methods=['POST'])
-def send_email_endpoint():
-    """Send email with PDF attachment"""
+def send_email_payload(data):
+    """Validate a send-email request and send the PDF, returning (body, status)"""
     try:
-        data = request.get_json()
-        
         if not data or 'email' not in data or 'pdf_path' not in data:
-            return jsonify({
+            return {
                 "success": False,
                 "error": "Email and PDF path are required"
-            }), 400
+            }, 400
         
         recipient_email = data['email']
         pdf_filename = data['pdf_path']
         meeting_title = data.get('meeting_title', 'Meeting Summary')
         
         # Validate email format
-        import re
-        email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        if not re.match(email_pattern, recipient_email):
-            return jsonify({
+        if not re.match(EMAIL_PATTERN, recipient_email):
+            return {
                 "success": False,
                 "error": "Invalid email format"
-            }), 400
+            }, 400
         
         # Construct full path to PDF
-        pdf_path = os.path.join(OUTPUT_DIR, pdf_filename)
+        pdf_path = output_file_path(pdf_filename)
         
-        if not os.path.exists(pdf_path):
-            return jsonify({
+        if pdf_path is None:
+            return {
                 "success": False,
                 "error": "PDF file not found"
-            }), 404
+            }, 404
         
         # Send email
         if send_email_with_pdf(recipient_email, pdf_path, meeting_title):
-            return jsonify({
+            return {
                 "success": True,
                 "message": f"Email sent successfully to {recipient_email}"
-            })
-        else:
-            return jsonify({
-                "success": False,
-                "error": "Failed to send email. Please check email configuration."
-            }), 500
+            }, 200
+        return {
+            "success": False,
+            "error": "Failed to send email. Please check email configuration."
+        }, 500
             
     except Exception as e:
         logger.error(f"Error in send_email_endpoint: {e}")
-        return jsonify({
+        return {
             "success": False,
             "error": str(e)
-        }), 500
+        }, 500
+
+@app.route('/send-email', methods=['POST'])
+def send_email_endpoint():
+    """Send email with PDF attachment"""
+    payload, status = send_email_payload(request.get_json(silent=True))
+    return jsonify(payload), status
 
 def create_google_meet():
     """Create a Google Meet link using your existing OAuth setup"""
@@ -275,248 +303,191 @@ def create_google_meet():
 
 def load_models():
     """Load Whisper and summarization models"""
-    global whisper_model, summarizer
+    global whisper_model, summarizer, default_tier
     
     try:
-        logger.info("Loading Whisper model...")
-        whisper_model = whisper.load_model("base")
-        logger.info("Whisper model loaded successfully")
-        
-        logger.info("Loading summarization model...")
-        summarizer = pipeline(
-            "summarization", 
-            model="facebook/bart-large-cnn",
-            device=0 if os.system("nvidia-smi") == 0 else -1
-        )
-        logger.info("Summarization model loaded successfully")
+        logger.info(f"Loading models for default tier '{DEFAULT_TIER}'...")
+        whisper_model, summarizer = model_manager.get(DEFAULT_TIER)
+        default_tier = DEFAULT_TIER
+        logger.info("Models loaded successfully")
         
     except Exception as e:
         logger.error(f"Error loading models: {e}")
         try:
-            whisper_model = whisper.load_model("tiny")
-            summarizer = pipeline("summarization", model="sshleifer/distilbart-cnn-12-6")
+            whisper_model, summarizer = model_manager.get('fast')
+            default_tier = 'fast'
             logger.info("Fallback models loaded successfully")
         except Exception as fallback_error:
             logger.error(f"Failed to load fallback models: {fallback_error}")
+            return
+    
+    for tier in PRELOAD_TIERS:
+        try:
+            model_manager.get(tier)
+        except Exception as e:
+            logger.error(f"Error preloading tier {tier}: {e}")
 
-def transcribe_audio(audio_path):
-    """Transcribe audio using Whisper"""
-    try:
-        logger.info(f"Transcribing audio: {audio_path}")
-        result = whisper_model.transcribe(audio_path)
-        return result["text"]
-    except Exception as e:
-        logger.error(f"Error transcribing audio: {e}")
-        return None
-
-def summarize_transcript(transcript):
-    """Summarize the transcript using the loaded summarization model"""
-    try:
-        logger.info("Summarizing transcript...")
-        
-        if summarizer is None:
-            logger.error("Summarizer model not loaded")
-            return None
-        
-        max_chunk_length = 1000
-        words = transcript.split()
-        
-        if len(words) <= max_chunk_length:
-            summary = summarizer(transcript, max_length=200, min_length=50, do_sample=False)
-            return summary[0]['summary_text']
-        else:
-            chunks = []
-            chunk_summaries = []
-            
-            for i in range(0, len(words), max_chunk_length):
-                chunk = ' '.join(words[i:i + max_chunk_length])
-                chunks.append(chunk)
-            
-            logger.info(f"Splitting transcript into {len(chunks)} chunks for summarization")
-            
-            for i, chunk in enumerate(chunks):
-                try:
-                    chunk_summary = summarizer(chunk, max_length=150, min_length=30, do_sample=False)
-                    chunk_summaries.append(chunk_summary[0]['summary_text'])
-                    logger.info(f"Summarized chunk {i+1}/{len(chunks)}")
-                except Exception as chunk_error:
-                    logger.error(f"Error summarizing chunk {i+1}: {chunk_error}")
-                    sentences = chunk.split('.')[:3]
-                    fallback_summary = '. '.join(sentences).strip()
-                    if fallback_summary:
-                        chunk_summaries.append(fallback_summary + '.')
-            
-            combined_summary = ' '.join(chunk_summaries)
-            
-            if len(combined_summary.split()) > 300:
-                final_summary = summarizer(combined_summary, max_length=200, min_length=50, do_sample=False)
-                return final_summary[0]['summary_text']
-            else:
-                return combined_summary
-            
-    except Exception as e:
-        logger.error(f"Error summarizing transcript: {e}")
-        sentences = transcript.split('.')[:5]
-        fallback = '. '.join(sentences).strip()
-        return fallback + '.' if fallback else transcript[:500] + "..."
-
-def extract_bullet_points(summary):
-    """Extract bullet points from the summary"""
-    try:
-        logger.info("Extracting bullet points from summary...")
-        
-        sentences = re.split(r'[.!?]+', summary)
-        sentences = [s.strip() for s in sentences if s.strip()]
-        
-        bullet_points = []
-        
-        for sentence in sentences:
-            if len(sentence.split()) < 3:
-                continue
-            
-            sentence = sentence.strip()
-            
-            if len(sentence) > 1:
-                sentence = sentence[0].upper() + sentence[1:]
-            
-            if not sentence.endswith(('.', '!', '?')):
-                sentence += '.'
-            
-            bullet_points.append(sentence)
-        
-        bullet_points = bullet_points[:10]
-        
-        if not bullet_points and summary:
-            parts = re.split(r'\b(and|also|furthermore|additionally|moreover|however|but|while)\b', summary)
-            for part in parts:
-                part = part.strip()
-                if len(part.split()) >= 5 and part not in ['and', 'also', 'furthermore', 'additionally', 'moreover', 'however', 'but', 'while']:
-                    if len(part) > 1:
-                        part = part[0].upper() + part[1:]
-                    if not part.endswith(('.', '!', '?')):
-                        part += '.'
-                    bullet_points.append(part)
-                    if len(bullet_points) >= 8:
-                        break
-        
-        logger.info(f"Extracted {len(bullet_points)} bullet points")
-        return bullet_points
-        
-    except Exception as e:
-        logger.error(f"Error extracting bullet points: {e}")
-        sentences = summary.split('.')[:5] if summary else ["No bullet points could be extracted."]
-        return [s.strip() + '.' for s in sentences if s.strip()]
-
-def create_bullet_points_pdf(bullet_points, filename):
-    """Create PDF with bullet points"""
-    try:
-        logger.info(f"Creating bullet points PDF: {filename}")
-        
-        doc = SimpleDocTemplate(filename, pagesize=letter, 
-                              leftMargin=0.75*inch, rightMargin=0.75*inch,
-                              topMargin=1*inch, bottomMargin=1*inch)
-        styles = getSampleStyleSheet()
-        story = []
-        
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=28,
-            textColor=HexColor('#1a365d'),
-            alignment=TA_CENTER,
-            spaceAfter=40,
-            fontName='Helvetica-Bold'
-        )
-        
-        subtitle_style = ParagraphStyle(
-            'CustomSubtitle',
-            parent=styles['Normal'],
-            fontSize=12,
-            textColor=HexColor('#4a5568'),
-            alignment=TA_CENTER,
-            spaceAfter=30,
-            fontName='Helvetica'
-        )
-        
-        bullet_style = ParagraphStyle(
-            'BulletStyle',
-            parent=styles['Normal'],
-            fontSize=12,
-            textColor=HexColor('#2d3748'),
-            leftIndent=0,
-            spaceBefore=8,
-            spaceAfter=8,
-            fontName='Helvetica',
-            leading=18
-        )
-        
-        story.append(Paragraph("📋 Meeting Summary - Key Points", title_style))
-        story.append(Paragraph(
-            f"Generated on {datetime.now().strftime('%B %d, %Y at %I:%M %p')}", 
-            subtitle_style
-        ))
-        story.append(Spacer(1, 0.3*inch))
-        
-        if bullet_points:
-            for i, point in enumerate(bullet_points, 1):
-                formatted_point = f"• {point}"
-                story.append(Paragraph(formatted_point, bullet_style))
-        else:
-            story.append(Paragraph("• No key points could be extracted from the recording.", bullet_style))
-        
-        story.append(Spacer(1, 0.5*inch))
-        
-        footer_style = ParagraphStyle(
-            'Footer',
-            parent=styles['Normal'],
-            fontSize=10,
-            textColor=HexColor('#718096'),
-            alignment=TA_CENTER,
-            fontName='Helvetica-Oblique'
-        )
-        
-        story.append(Paragraph("Generated by Google Meet Recorder", footer_style))
-        
-        doc.build(story)
-        logger.info(f"Bullet points PDF created successfully: {filename}")
-        return True
-        
-    except Exception as e:
-        logger.error(f"Error creating bullet points PDF: {e}")
-        return False
-
-@app.route('/create-meet', methods=['POST'])
-def create_meet_endpoint():
-    """Create a Google Meet link"""
+def create_meet_payload():
+    """Create a Google Meet link, returning (body, status)"""
     try:
         meet_link = create_google_meet()
         if meet_link:
-            return jsonify({
+            return {
                 "success": True,
                 "meet_link": meet_link,
                 "message": "Google Meet created successfully!"
-            })
-        else:
-            return jsonify({
-                "success": False,
-                "error": "Failed to create Google Meet link"
-            }), 500
+            }, 200
+        return {
+            "success": False,
+            "error": "Failed to create Google Meet link"
+        }, 500
     except Exception as e:
         logger.error(f"Error in create_meet_endpoint: {e}")
-        return jsonify({
+        return {
             "success": False,
             "error": str(e)
-        }), 500
+        }, 500
 
-@app.route('/health', methods=['GET'])
-def health_check():
-    """Health check endpoint"""
-    return jsonify({
+@app.route('/create-meet', methods=['POST'])
+def create_meet_endpoint():
+    """Create a Google Meet link"""
+    payload, status = create_meet_payload()
+    return jsonify(payload), status
+
+def health_payload():
+    """Collect model, scheduler and index status"""
+    return {
         "status": "healthy",
         "whisper_loaded": whisper_model is not None,
         "summarizer_loaded": summarizer is not None,
-        "email_configured": EMAIL_CONFIG['email'] != 'your_email@gmail.com'
-    })
+        "model_tiers_loaded": model_manager.loaded_tiers(),
+        "email_configured": EMAIL_CONFIG['email'] != 'your_email@gmail.com',
+        "scheduler": scheduler.stats(),
+        "search_index": search_index.stats()
+    }
+
+@app.route('/health', methods=['GET'])
+def health_check():
+    """Health check endpoint"""
+    return jsonify(health_payload())
+
+def tenant_id(headers, remote_addr):
+    """Identify the user a request belongs to from its headers and client address"""
+    if TRUST_USER_HEADER and headers.get('X-User-Id'):
+        return headers['X-User-Id']
+    return remote_addr or 'anonymous'
+
+def get_tenant_id():
+    """Identify the user of the current request"""
+    return tenant_id(request.headers, request.remote_addr)
+
+def select_models(duration, quality_hint='auto'):
+    """Pick a model tier for a job based on its duration and the queue backlog"""
+    _, backlog = scheduler.queue_depth()
+    tier, reason = model_manager.choose_tier(duration, backlog, quality_hint)
+    
+    try:
+        models = model_manager.get(tier)
+    except Exception as e:
+        logger.error(f"Error loading models for tier {tier}: {e}")
+        tier, reason = default_tier, f"tier {tier} unavailable"
+        models = (whisper_model, summarizer)
+    
+    logger.info(f"Using model tier '{tier}' ({reason})")
+    return dict(MODEL_TIERS[tier], name=tier, reason=reason), models
+
+def run_pipeline(audio_path, unique_id, quality_hint='auto'):
+    """Transcribe, summarize and build the PDF for a saved recording"""
+    try:
+        audio = whisper.load_audio(audio_path)
+    except Exception as e:
+        logger.error(f"Error decoding audio: {e}")
+        return {"error": "Failed to decode audio"}
+    
+    model_tier, models = select_models(len(audio) / whisper.audio.SAMPLE_RATE, quality_hint)
+    result = analyze_audio(audio, models)
+    del audio
+    if not result.get("success"):
+        return result
+    
+    pdf_filename = f"meeting_summary_{unique_id}.pdf"
+    pdf_path = os.path.join(OUTPUT_DIR, pdf_filename)
+    
+    if not create_bullet_points_pdf(result["bullet_points"], pdf_path, result["sections"]):
+        return {"error": "Failed to create bullet points PDF"}
+    
+    archive_filename = f"transcript_{unique_id}.mta"
+    if not archive_transcript(result, os.path.join(OUTPUT_DIR, archive_filename)):
+        return {"error": "Failed to write transcript archive"}
+    result["archive_path"] = archive_filename
+    
+    try:
+        os.remove(audio_path)
+    except:
+        pass
+    
+    result.update(meeting_id=unique_id, pdf_path=pdf_filename, model_tier=model_tier)
+    
+    try:
+        search_index.add_meeting(unique_id, result)
+    except Exception as e:
+        logger.error(f"Error indexing meeting {unique_id}: {e}")
+    
+    return result
+
+def job_payload(job):
+    """Return the response body and status code for a scheduled job"""
+    if job.status == 'done':
+        result = job.result
+        if result.get("success"):
+            return dict(result, job_id=job.id), 200
+        return dict(result, job_id=job.id), 500
+    if job.status == 'failed':
+        return {"error": job.error, "job_id": job.id}, 500
+    
+    return dict(
+        job.to_dict(),
+        queue_position=scheduler.position(job),
+        eta_seconds=round(scheduler.eta(job), 1)
+    ), 202
+
+def job_response(job):
+    """Build the JSON response for a scheduled job"""
+    payload, status = job_payload(job)
+    return jsonify(payload), status
+
+def intake_error(quality_hint):
+    """Return (body, status) if a recording cannot be accepted, or None"""
+    if whisper_model is None:
+        return {"error": "Whisper model not loaded. Please check server logs."}, 500
+    
+    if summarizer is None:
+        return {"error": "Summarization model not loaded. Please check server logs."}, 500
+    
+    if quality_hint not in QUALITY_HINTS and quality_hint not in MODEL_TIERS:
+        return {
+            "error": f"Quality must be one of: {', '.join(QUALITY_HINTS + tuple(TIER_ORDER))}"
+        }, 400
+    return None
+
+def submit_recording(tenant, audio_path, unique_id, quality_hint):
+    """Queue a saved recording, returning (job, None) or (None, (body, status))"""
+    duration = get_audio_duration(audio_path)
+    
+    try:
+        job = scheduler.submit(tenant, run_pipeline, audio_path, unique_id,
+                               quality_hint, duration=duration)
+        return job, None
+    except AdmissionError as e:
+        try:
+            os.remove(audio_path)
+        except OSError:
+            pass
+        return None, ({
+            "error": str(e),
+            "queue_position": e.position,
+            "eta_seconds": round(e.eta, 1) if e.eta is not None else None
+        }, 429)
 
 @app.route('/process-audio', methods=['POST'])
 def process_audio():
@@ -529,6 +500,11 @@ def process_audio():
         if audio_file.filename == '':
             return jsonify({"error": "No audio file selected"}), 400
         
+        quality_hint = request.form.get('quality', 'auto')
+        error = intake_error(quality_hint)
+        if error:
+            return jsonify(error[0]), error[1]
+        
         unique_id = str(uuid.uuid4())
         audio_filename = f"{unique_id}.webm"
         audio_path = os.path.join(UPLOAD_DIR, audio_filename)
@@ -536,60 +512,144 @@ def process_audio():
         audio_file.save(audio_path)
         logger.info(f"Audio file saved: {audio_path}")
         
-        if whisper_model is None:
-            return jsonify({"error": "Whisper model not loaded. Please check server logs."}), 500
-        
-        if summarizer is None:
-            return jsonify({"error": "Summarization model not loaded. Please check server logs."}), 500
-        
-        transcription = transcribe_audio(audio_path)
-        if transcription is None:
-            return jsonify({"error": "Failed to transcribe audio"}), 500
-        
-        logger.info("Transcription completed")
-        
-        summary = summarize_transcript(transcription)
-        if summary is None:
-            return jsonify({"error": "Failed to summarize transcript"}), 500
-        
-        logger.info("Summarization completed")
+        job, rejected = submit_recording(get_tenant_id(), audio_path, unique_id, quality_hint)
+        if rejected:
+            return jsonify(rejected[0]), rejected[1]
         
-        bullet_points = extract_bullet_points(summary)
-        logger.info(f"Extracted {len(bullet_points)} bullet points")
+        # Clients can pass wait=false to poll /jobs/<job_id> instead of blocking
+        if request.form.get('wait', 'true').lower() == 'false':
+            return job_response(job)
         
-        pdf_filename = f"meeting_summary_{unique_id}.pdf"
-        pdf_path = os.path.join(OUTPUT_DIR, pdf_filename)
-        
-        if create_bullet_points_pdf(bullet_points, pdf_path):
-            try:
-                os.remove(audio_path)
-            except:
-                pass
-            
-            return jsonify({
-                "success": True,
-                "transcription": transcription,
-                "summary": summary,
-                "bullet_points": bullet_points,
-                "pdf_path": pdf_filename
-            })
-        else:
-            return jsonify({"error": "Failed to create bullet points PDF"}), 500
+        job.wait()
+        return job_response(job)
             
     except Exception as e:
         logger.error(f"Error processing audio: {e}")
         return jsonify({"error": str(e)}), 500
 
+@app.route('/jobs/<job_id>', methods=['GET'])
+def job_status(job_id):
+    """Return the status, queue position and ETA of a job"""
+    job = scheduler.get(job_id)
+    if job is None:
+        return jsonify({"error": "Job not found"}), 404
+    return job_response(job)
+
+def output_file_path(filename):
+    """Return the path of a meeting's PDF or transcript archive, or None if it is missing"""
+    path = os.path.join(OUTPUT_DIR, filename)
+    if os.path.exists(path):
+        return path
+    
+    # Meetings indexed by batch.py store absolute paths into the batch output tree
+    match = OUTPUT_FILE_PATTERN.match(filename)
+    files = search_index.meeting_files(match.group(1)) if match else None
+    if files:
+        path = files['pdf_path' if match.group(2) == 'pdf' else 'archive_path']
+        if path and os.path.isabs(path) and os.path.exists(path):
+            return path
+    return None
+
+def search_hits(query, limit, mode):
+    """Search the index, naming PDFs the way /download serves them"""
+    hits = search_index.search(query, limit=limit, mode=mode)
+    for hit in hits:
+        if hit["pdf_path"] and os.path.isabs(hit["pdf_path"]):
+            hit["pdf_path"] = f"meeting_summary_{hit['meeting_id']}.pdf"
+    return hits
+
+def read_transcript_range(meeting_id, start, end):
+    """Read the words and segments of a meeting between two timestamps"""
+    archive_path = output_file_path(f"transcript_{meeting_id}.mta")
+    if archive_path is None:
+        return None
+    with TranscriptArchive(archive_path) as archive:
+        return {
+            "success": True,
+            "meeting_id": meeting_id,
+            "start": start,
+            "end": end,
+            "speakers": archive.speakers,
+            "segments": archive.segments(start, end),
+            "words": archive.words(start, end)
+        }
+
+def transcript_payload(meeting_id, args):
+    """Read the ?start= to ?end= part of a transcript, returning (body, status)"""
+    try:
+        start = float(args.get('start', 0))
+        end = float(args['end']) if 'end' in args else None
+    except ValueError:
+        return {"success": False, "error": "Start and end must be numbers"}, 400
+    
+    try:
+        transcript = read_transcript_range(meeting_id, start, end)
+        if transcript is None:
+            return {"success": False, "error": "Transcript not found"}, 404
+        return transcript, 200
+    except Exception as e:
+        logger.error(f"Error reading transcript: {e}")
+        return {"success": False, "error": str(e)}, 500
+
+@app.route('/transcript/<meeting_id>', methods=['GET'])
+def get_transcript(meeting_id):
+    """Return the transcript of a meeting between ?start= and ?end= seconds"""
+    payload, status = transcript_payload(meeting_id, request.args)
+    return jsonify(payload), status
+
+def search_payload(args):
+    """Validate the search parameters and run the search, returning (body, status)"""
+    query = args.get('q', '').strip()
+    if not query:
+        return {"success": False, "error": "Query parameter 'q' is required"}, 400
+    
+    mode = args.get('mode', 'text')
+    if mode not in ('text', 'semantic'):
+        return {"success": False, "error": "Mode must be 'text' or 'semantic'"}, 400
+    
+    try:
+        limit = min(int(args.get('limit', 10)), 100)
+    except ValueError:
+        return {"success": False, "error": "Limit must be an integer"}, 400
+    
+    try:
+        start = datetime.now()
+        results = search_hits(query, limit, mode)
+        took_ms = (datetime.now() - start).total_seconds() * 1000
+    except Exception as e:
+        logger.error(f"Error searching meetings: {e}")
+        return {"success": False, "error": str(e)}, 500
+    
+    return {
+        "success": True,
+        "query": query,
+        "mode": mode,
+        "results": results,
+        "took_ms": round(took_ms, 2)
+    }, 200
+
+@app.route('/search', methods=['GET'])
+def search_meetings():
+    """Search past meeting transcripts, summaries and bullet points"""
+    payload, status = search_payload(request.args)
+    return jsonify(payload), status
+
+def download_name(filename):
+    """Return the attachment name for a file in OUTPUT_DIR, keeping its extension"""
+    extension = os.path.splitext(filename)[1].lower()
+    kind = "transcript" if extension == ".mta" else "summary"
+    return f"meeting-{kind}-{datetime.now().strftime('%Y%m%d-%H%M%S')}{extension}"
+
 @app.route('/download/<filename>', methods=['GET'])
 def download_file(filename):
-    """Download generated PDF file"""
+    """Download a generated PDF or transcript archive"""
     try:
-        file_path = os.path.join(OUTPUT_DIR, filename)
-        if os.path.exists(file_path):
+        file_path = output_file_path(filename)
+        if file_path is not None:
             return send_file(
                 file_path,
                 as_attachment=True,
-                download_name=f"meeting-summary-{datetime.now().strftime('%Y%m%d-%H%M%S')}.pdf"
+                download_name=download_name(filename)
             )
         else:
             return jsonify({"error": "File not found"}), 404
@@ -607,5 +667,6 @@ if __name__ == '__main__':
         logger.info("Email configuration detected")
     
     load_models()
+    scheduler.start()
     
     app.run(host='0.0.0.0', port=5000, debug=True)
\ No newline at end of file
@@ -0,0 +1,226 @@
+"""
+Asynchronous ASGI front end for the Meet Summarizer backend.
+
+Serves the I/O-bound endpoints (upload intake, job status and events,
+downloads, email, search, health) with Quart on an asyncio event loop.
+Uploads and downloads are streamed, and anything that blocks (SMTP, ffprobe,
+SQLite, Google API calls) runs in a thread executor. Transcription and
+summarization still run on the scheduler worker threads from app.py; handlers
+only await job completion, so idle polling or SSE clients cost no threads.
+
+Run with:
+    hypercorn asgi_app:app --bind 0.0.0.0:5000
+"""
+import asyncio
+import json
+import os
+import uuid
+
+from quart import Quart, request, jsonify, send_file, render_template, Response
+from quart_cors import cors
+
+import app as backend
+
+logger = backend.logger
+
+app = Quart(__name__)
+app = cors(app)  # Enable CORS for all routes
+
+app.config['MAX_CONTENT_LENGTH'] = int(os.environ.get('MAX_UPLOAD_BYTES', 2 * 1024 ** 3))
+app.config['BODY_TIMEOUT'] = int(os.environ.get('UPLOAD_TIMEOUT', 3600))
+# Quart cancels responses after 60 s by default, which cuts off large downloads
+app.config['RESPONSE_TIMEOUT'] = int(os.environ.get('DOWNLOAD_TIMEOUT', 3600))
+
+SSE_INTERVAL = 5  # Seconds between progress events on /jobs/<id>/events
+
+
+@app.before_serving
+async def startup():
+    """Load models off the event loop and start the scheduler"""
+    await asyncio.to_thread(backend.load_models)
+    backend.scheduler.start()
+
+
+def job_future(job):
+    """Return an asyncio future that resolves when the job finishes"""
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+
+    def on_done(_job):
+        loop.call_soon_threadsafe(lambda: future.done() or future.set_result(None))
+
+    job.add_done_callback(on_done)
+    return future
+
+
+def is_multipart():
+    return bool(request.mimetype and request.mimetype.startswith('multipart/'))
+
+
+async def save_upload(audio_path):
+    """Stream the uploaded audio to disk, returning the form/query parameters"""
+    try:
+        if is_multipart():
+            # Quart spools multipart file parts to a temporary file while parsing
+            files = await request.files
+            form = await request.form
+            audio_file = files.get('audio')
+            if audio_file is None or audio_file.filename == '':
+                return None, form
+            await audio_file.save(audio_path)
+            return audio_path, form
+
+        # Raw audio body (e.g. fetch with a Blob body), written chunk by chunk
+        size = 0
+        with open(audio_path, "wb") as f:
+            async for chunk in request.body:
+                size += len(chunk)
+                await asyncio.to_thread(f.write, chunk)
+        if not size:
+            os.remove(audio_path)
+            return None, request.args
+        return audio_path, request.args
+    except BaseException:
+        # Client disconnects and BODY_TIMEOUT cancel the handler mid-stream
+        if os.path.exists(audio_path):
+            os.remove(audio_path)
+        raise
+
+
+@app.route('/')
+async def index():
+    """Serve the main HTML page"""
+    return await render_template('index.html')
+
+
+@app.route('/health', methods=['GET'])
+async def health_check():
+    """Health check endpoint"""
+    return jsonify(await asyncio.to_thread(backend.health_payload))
+
+
+@app.route('/process-audio', methods=['POST'])
+async def process_audio():
+    """Accept an uploaded recording and queue it for processing"""
+    try:
+        # Reject before receiving the body where possible; multipart uploads
+        # carry their quality field in the body, so it is checked after parsing
+        error = backend.intake_error('auto' if is_multipart() else
+                                     request.args.get('quality', 'auto'))
+        if error:
+            return jsonify(error[0]), error[1]
+
+        unique_id = str(uuid.uuid4())
+        audio_path = os.path.join(backend.UPLOAD_DIR, f"{unique_id}.webm")
+
+        saved_path, params = await save_upload(audio_path)
+        if saved_path is None:
+            return jsonify({"error": "No audio file provided"}), 400
+        logger.info(f"Audio file saved: {audio_path}")
+
+        quality_hint = params.get('quality', 'auto')
+        error = backend.intake_error(quality_hint)
+        if error:
+            os.remove(audio_path)
+            return jsonify(error[0]), error[1]
+
+        job, rejected = await asyncio.to_thread(
+            backend.submit_recording, backend.tenant_id(request.headers, request.remote_addr),
+            audio_path, unique_id, quality_hint
+        )
+        if rejected:
+            return jsonify(rejected[0]), rejected[1]
+
+        # Clients can pass wait=false to poll /jobs/<job_id> instead of waiting
+        if params.get('wait', 'true').lower() != 'false':
+            await job_future(job)
+
+        payload, status = backend.job_payload(job)
+        return jsonify(payload), status
+
+    except Exception as e:
+        logger.error(f"Error processing audio: {e}")
+        return jsonify({"error": str(e)}), 500
+
+
+@app.route('/jobs/<job_id>', methods=['GET'])
+async def job_status(job_id):
+    """Return the status, queue position and ETA of a job"""
+    job = backend.scheduler.get(job_id)
+    if job is None:
+        return jsonify({"error": "Job not found"}), 404
+    payload, status = backend.job_payload(job)
+    return jsonify(payload), status
+
+
+@app.route('/jobs/<job_id>/events', methods=['GET'])
+async def job_events(job_id):
+    """Stream job progress as server-sent events until the job finishes"""
+    job = backend.scheduler.get(job_id)
+    if job is None:
+        return jsonify({"error": "Job not found"}), 404
+
+    async def events():
+        done = job_future(job)
+        while True:
+            try:
+                await asyncio.wait_for(asyncio.shield(done), timeout=SSE_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+            payload, status = backend.job_payload(job)
+            event = "progress" if status == 202 else "result"
+            yield f"event: {event}\ndata: {json.dumps(payload)}\n\n".encode("utf-8")
+            if status != 202:
+                return
+
+    response = Response(events(), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.timeout = None  # Keep the stream open for long jobs
+    return response
+
+
+@app.route('/download/<filename>', methods=['GET'])
+async def download_file(filename):
+    """Stream a generated PDF or transcript archive"""
+    try:
+        file_path = await asyncio.to_thread(backend.output_file_path, filename)
+        if file_path is None:
+            return jsonify({"error": "File not found"}), 404
+        return await send_file(
+            file_path,
+            as_attachment=True,
+            download_name=backend.download_name(filename)
+        )
+    except Exception as e:
+        logger.error(f"Error downloading file: {e}")
+        return jsonify({"error": str(e)}), 500
+
+
+@app.route('/send-email', methods=['POST'])
+async def send_email_endpoint():
+    """Send email with PDF attachment"""
+    data = await request.get_json(silent=True)
+    payload, status = await asyncio.to_thread(backend.send_email_payload, data)
+    return jsonify(payload), status
+
+
+@app.route('/transcript/<meeting_id>', methods=['GET'])
+async def get_transcript(meeting_id):
+    """Return the transcript of a meeting between ?start= and ?end= seconds"""
+    payload, status = await asyncio.to_thread(backend.transcript_payload, meeting_id,
+                                              request.args)
+    return jsonify(payload), status
+
+
+@app.route('/search', methods=['GET'])
+async def search_meetings():
+    """Search past meeting transcripts, summaries and bullet points"""
+    payload, status = await asyncio.to_thread(backend.search_payload, request.args)
+    return jsonify(payload), status
+
+
+@app.route('/create-meet', methods=['POST'])
+async def create_meet_endpoint():
+    """Create a Google Meet link"""
+    payload, status = await asyncio.to_thread(backend.create_meet_payload)
+    return jsonify(payload), status
@@ -0,0 +1,383 @@
+"""
+Headless batch processing for an archive of meeting recordings.
+
+Media files are decoded to 16 kHz PCM by a pool of ffmpeg decoder processes
+and handed to a fixed number of model worker processes that run the same
+transcription, speaker clustering and summarization as the web app. Each
+recording gets its own folder in the output tree, and every finished file is
+recorded in a manifest so an interrupted run can be resumed.
+
+Usage:
+    python batch.py /path/to/recordings --output batch_output
+    python batch.py recordings.txt --output batch_output --resume
+"""
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import subprocess
+import sys
+import threading
+import time
+import uuid
+
+import numpy as np
+
+from model_tiers import DEFAULT_TIER, TIER_ORDER, MODEL_TIERS, ModelManager
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_RATE = 16000
+MEDIA_EXTENSIONS = ('.mp4', '.mov', '.mkv', '.avi', '.webm', '.mp3', '.wav',
+                    '.m4a', '.ogg', '.flac', '.aac')
+MANIFEST_NAME = "manifest.jsonl"
+DECODED_DIR = ".decoded"
+
+# Pipeline module and models loaded inside each model worker process
+_pipeline = None
+_models = None
+_model_tier = None
+
+
+def find_sources(input_path, extensions=MEDIA_EXTENSIONS):
+    """Return (source path, relative name) pairs from a directory or manifest file"""
+    sources = []
+    if os.path.isdir(input_path):
+        for root, dirs, files in os.walk(input_path):
+            dirs.sort()
+            for name in sorted(files):
+                if name.lower().endswith(extensions):
+                    path = os.path.join(root, name)
+                    sources.append((path, os.path.relpath(path, input_path)))
+        return sources
+
+    # Manifest: one path per line (or a JSON object with a "path" key)
+    base_dir = os.path.dirname(os.path.abspath(input_path))
+    with open(input_path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            path = json.loads(line)["path"] if line.startswith('{') else line
+            if os.path.isabs(path):
+                relative = os.path.splitdrive(os.path.normpath(path))[1].lstrip(os.sep)
+            else:
+                relative = os.path.normpath(path)
+                path = os.path.join(base_dir, path)
+                if relative.split(os.sep)[0] == os.pardir:
+                    # Outside the manifest's folder: mirror the absolute path so
+                    # the outputs still land inside the output root
+                    relative = os.path.splitdrive(os.path.abspath(path))[1].lstrip(os.sep)
+            sources.append((path, relative))
+    return sources
+
+
+def meeting_id(source):
+    """Return a stable meeting id for a source file"""
+    return str(uuid.uuid5(uuid.NAMESPACE_URL, os.path.abspath(source)))
+
+
+def output_name(relative):
+    """Return the output folder name for a source, keeping its extension"""
+    # rec.mp4 and rec.wav in the same folder must not share outputs
+    base, extension = os.path.splitext(relative)
+    return f"{base}_{extension.lstrip('.')}" if extension else base
+
+
+def fingerprint(path):
+    """Return the size and modification time used to detect changed sources"""
+    stat = os.stat(path)
+    return {"size": stat.st_size, "mtime": int(stat.st_mtime)}
+
+
+def load_manifest(output_root):
+    """Return the latest manifest record for every source"""
+    records = {}
+    manifest_path = os.path.join(output_root, MANIFEST_NAME)
+    if os.path.exists(manifest_path):
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                    records[record["source"]] = record
+                except (ValueError, KeyError):
+                    continue
+    return records
+
+
+def decode_media(source, pcm_path):
+    """Decode a media file to mono 16 kHz 16-bit PCM on disk (runs in a decoder process)"""
+    subprocess.run(
+        ['ffmpeg', '-nostdin', '-v', 'error', '-y', '-i', source,
+         '-vn', '-ac', '1', '-ar', str(SAMPLE_RATE), '-f', 's16le', pcm_path],
+        check=True, capture_output=True
+    )
+    return os.path.getsize(pcm_path) / 2 / SAMPLE_RATE
+
+
+def init_model_worker(threads, tier):
+    """Load the models of a tier once per model worker process"""
+    global _pipeline, _models, _model_tier
+    import torch
+    torch.set_num_threads(threads)
+
+    import meeting_pipeline
+    try:
+        _models = ModelManager().get(tier)
+    except Exception as e:
+        logger.error(f"Models failed to load in batch worker: {e}")
+        return
+    _model_tier = dict(MODEL_TIERS[tier], name=tier, reason="batch")
+    _pipeline = meeting_pipeline
+
+
+def process_decoded(pcm_path, output_dir, meeting_id):
+    """Run inference on decoded audio and write the outputs (runs in a model worker)"""
+    if _pipeline is None:
+        os.remove(pcm_path)
+        raise RuntimeError("Models are not loaded in this worker")
+
+    try:
+        audio = np.fromfile(pcm_path, dtype=np.int16).astype(np.float32) / 32768.0
+    finally:
+        try:
+            os.remove(pcm_path)
+        except OSError:
+            pass
+
+    result = _pipeline.analyze_audio(audio, _models)
+    del audio
+    if not result.get("success"):
+        raise RuntimeError(result.get("error", "Processing failed"))
+    output_dir = os.path.abspath(output_dir)
+    result.update(meeting_id=meeting_id, model_tier=_model_tier,
+                  pdf_path=os.path.join(output_dir, "bullet_points.pdf"),
+                  archive_path=os.path.join(output_dir, "transcript.mta"))
+
+    os.makedirs(output_dir, exist_ok=True)
+    if not _pipeline.archive_transcript(result, result["archive_path"]):
+        raise RuntimeError("Failed to write transcript archive")
+    with open(os.path.join(output_dir, "transcript.txt"), "w", encoding="utf-8") as f:
+        f.write(result["transcription"])
+    with open(os.path.join(output_dir, "summary.txt"), "w", encoding="utf-8") as f:
+        f.write(result["summary"])
+    if not _pipeline.create_bullet_points_pdf(result["bullet_points"], result["pdf_path"],
+                                              result["sections"]):
+        raise RuntimeError("Failed to create bullet points PDF")
+
+    # Written last: its presence marks the recording as complete
+    with open(os.path.join(output_dir, "result.json"), "w", encoding="utf-8") as f:
+        json.dump(result, f, ensure_ascii=False)
+    return result
+
+
+class Progress:
+    """Thread-safe counters with a periodic throughput report"""
+
+    def __init__(self, total, interval):
+        self.total = total
+        self.interval = interval
+        self.done = 0
+        self.failed = 0
+        self.skipped = 0
+        self.audio_seconds = 0.0
+        self.started = time.time()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        self.report()
+
+    def record(self, status, audio_seconds=0.0):
+        with self._lock:
+            if status == 'done':
+                self.done += 1
+                self.audio_seconds += audio_seconds
+            elif status == 'failed':
+                self.failed += 1
+            else:
+                self.skipped += 1
+
+    def report(self):
+        with self._lock:
+            elapsed = max(time.time() - self.started, 1e-6)
+            finished = self.done + self.failed + self.skipped
+            processed = self.done + self.failed
+            rate = processed / elapsed * 60
+            remaining = self.total - finished
+            eta = remaining / (processed / elapsed) if processed else None
+            realtime = self.audio_seconds / elapsed
+        eta_text = time.strftime('%H:%M:%S', time.gmtime(eta)) if eta is not None else "--:--:--"
+        print(f"📊 {finished}/{self.total} | done {self.done}, failed {self.failed}, "
+              f"skipped {self.skipped} | {rate:.1f} files/min | "
+              f"{self.audio_seconds / 3600:.2f} h audio ({realtime:.1f}x realtime) | "
+              f"ETA {eta_text}", flush=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.report()
+
+
+def run_batch(args):
+    """Process every source, returning the number of failed files"""
+    sources = find_sources(args.input)
+    output_root = args.output
+    decoded_dir = os.path.join(output_root, DECODED_DIR)
+    os.makedirs(decoded_dir, exist_ok=True)
+
+    previous = load_manifest(output_root) if args.resume else {}
+    manifest = open(os.path.join(output_root, MANIFEST_NAME), "a", encoding="utf-8")
+    manifest_lock = threading.Lock()
+
+    progress = Progress(len(sources), args.report_interval)
+    pending = threading.Semaphore(args.max_pending)
+    outstanding = [0]
+    all_done = threading.Condition()
+
+    def write_record(record):
+        with manifest_lock:
+            manifest.write(json.dumps(record) + "\n")
+            manifest.flush()
+
+    def finish(record, audio_seconds=0.0):
+        write_record(record)
+        progress.record(record["status"], audio_seconds)
+        if record["status"] == 'failed':
+            logger.error(f"Failed {record['source']}: {record['error']}")
+        pending.release()
+        with all_done:
+            outstanding[0] -= 1
+            all_done.notify_all()
+
+    cpu_count = os.cpu_count() or 1
+    threads = args.threads_per_worker or max(1, (cpu_count - args.decoders) // args.workers)
+    decoder_pool = multiprocessing.Pool(args.decoders)
+    model_pool = multiprocessing.Pool(args.workers, initializer=init_model_worker,
+                                      initargs=(threads, args.tier))
+
+    # Opened after the pools fork so workers never inherit the connection
+    search_index = None
+    if args.index_dir:
+        from search_index import SearchIndex
+        search_index = SearchIndex(args.index_dir)
+
+    progress.start()
+
+    try:
+        for source, relative in sources:
+            output_dir = os.path.join(output_root, output_name(relative))
+            record = {"source": source, "output": output_dir, "meeting_id": meeting_id(source)}
+
+            try:
+                record.update(fingerprint(source))
+            except OSError as e:
+                record.update(status='failed', error=str(e))
+                write_record(record)
+                progress.record('failed')
+                continue
+
+            done_before = previous.get(source)
+            if args.force:
+                already_done = False
+            elif done_before:
+                already_done = (done_before.get("status") == 'done'
+                                and done_before.get("size") == record["size"]
+                                and done_before.get("mtime") == record["mtime"])
+            else:
+                already_done = os.path.exists(os.path.join(output_dir, "result.json"))
+            if already_done:
+                progress.record('skipped')
+                continue
+
+            # Bound the number of recordings decoded but not yet processed
+            pending.acquire()
+            with all_done:
+                outstanding[0] += 1
+            pcm_path = os.path.join(decoded_dir, f"{uuid.uuid4().hex}.pcm")
+            started = time.time()
+
+            def on_processed(result, record=record, started=started):
+                record.update(status='done', elapsed=round(time.time() - started, 1))
+                if search_index is not None:
+                    try:
+                        search_index.add_meeting(record["meeting_id"], result)
+                    except Exception as e:
+                        logger.error(f"Error indexing {record['source']}: {e}")
+                finish(record, record["duration"])
+
+            def on_error(error, record=record, pcm_path=pcm_path):
+                if os.path.exists(pcm_path):
+                    os.remove(pcm_path)
+                record.update(status='failed', error=str(error))
+                finish(record)
+
+            def on_decoded(duration, record=record, pcm_path=pcm_path, output_dir=output_dir,
+                           on_processed=on_processed, on_error=on_error):
+                record["duration"] = round(duration, 2)
+                model_pool.apply_async(process_decoded,
+                                       (pcm_path, output_dir, record["meeting_id"]),
+                                       callback=on_processed, error_callback=on_error)
+
+            decoder_pool.apply_async(decode_media, (source, pcm_path),
+                                     callback=on_decoded, error_callback=on_error)
+
+        with all_done:
+            while outstanding[0]:
+                all_done.wait()
+    except KeyboardInterrupt:
+        print("\n⛔ Interrupted, stopping workers. Re-run with --resume to continue.")
+        decoder_pool.terminate()
+        model_pool.terminate()
+        progress.failed += 1
+    finally:
+        decoder_pool.close()
+        model_pool.close()
+        decoder_pool.join()
+        model_pool.join()
+        progress.stop()
+        manifest.close()
+
+    return progress.failed
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Batch transcribe and summarize recordings")
+    parser.add_argument("input", help="Directory of recordings or a manifest file of paths")
+    parser.add_argument("--output", default="batch_output", help="Root of the output tree")
+    parser.add_argument("--decoders", type=int, default=max(1, (os.cpu_count() or 2) // 2),
+                        help="Number of media decoder processes")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Number of model worker processes")
+    parser.add_argument("--threads-per-worker", type=int, default=0,
+                        help="Torch threads per model worker (default: split remaining CPUs)")
+    parser.add_argument("--tier", choices=TIER_ORDER, default=DEFAULT_TIER,
+                        help="Model tier used for every recording")
+    parser.add_argument("--max-pending", type=int, default=0,
+                        help="Maximum recordings decoded but not yet processed")
+    parser.add_argument("--resume", action="store_true",
+                        help="Skip sources recorded as done in the output manifest")
+    parser.add_argument("--force", action="store_true",
+                        help="Reprocess sources that already have outputs")
+    parser.add_argument("--index-dir", help="Also add results to this search index")
+    parser.add_argument("--report-interval", type=float, default=10.0,
+                        help="Seconds between progress reports")
+    args = parser.parse_args(argv)
+    if not args.max_pending:
+        args.max_pending = args.decoders + 2 * args.workers
+    return args
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    args = parse_args()
+    print(f"🚀 Batch processing {args.input} -> {args.output}")
+    failed = run_batch(args)
+    print("✅ Batch complete" if not failed else f"⚠️ Batch complete with {failed} failure(s)")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,177 @@
+"""
+Lightweight CPU speaker clustering for Whisper segments.
+
+Each transcript segment gets a voice embedding (its mean MFCC vector)
+computed with NumPy. Segments are grouped with agglomerative clustering (average linkage on
+cosine distance) and consecutive segments from the same speaker are merged
+into speaker turns.
+"""
+import logging
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_RATE = 16000  # Whisper decodes audio at 16 kHz
+
+DIARIZATION_CONFIG = {
+    'n_fft': 400,                # 25 ms analysis window
+    'hop_length': 160,           # 10 ms hop
+    'n_mels': 40,
+    'n_mfcc': 20,
+    'min_segment_seconds': 1.0,  # Shorter segments inherit a neighbour's speaker
+    'distance_threshold': 0.25,  # Stop merging clusters above this distance
+    'max_speakers': 8
+}
+
+
+def _mel_filterbank(n_fft, n_mels):
+    """Build a triangular mel filterbank matrix"""
+    def hz_to_mel(hz):
+        return 2595.0 * np.log10(1.0 + hz / 700.0)
+
+    def mel_to_hz(mel):
+        return 700.0 * (10 ** (mel / 2595.0) - 1.0)
+
+    mel_points = np.linspace(hz_to_mel(0), hz_to_mel(SAMPLE_RATE / 2), n_mels + 2)
+    bins = np.floor((n_fft + 1) * mel_to_hz(mel_points) / SAMPLE_RATE).astype(int)
+
+    filterbank = np.zeros((n_mels, n_fft // 2 + 1), dtype=np.float32)
+    for m in range(1, n_mels + 1):
+        left, center, right = bins[m - 1], bins[m], bins[m + 1]
+        for k in range(left, center):
+            filterbank[m - 1, k] = (k - left) / max(center - left, 1)
+        for k in range(center, right):
+            filterbank[m - 1, k] = (right - k) / max(right - center, 1)
+    return filterbank
+
+
+def _dct_matrix(n_mfcc, n_mels):
+    """Build an orthonormal DCT-II matrix"""
+    n = np.arange(n_mels)
+    k = np.arange(n_mfcc)[:, None]
+    dct = np.cos(np.pi / n_mels * (n + 0.5) * k) * np.sqrt(2.0 / n_mels)
+    dct[0] /= np.sqrt(2.0)
+    return dct.astype(np.float32)
+
+
+def compute_mfcc(audio, config=DIARIZATION_CONFIG):
+    """Compute MFCC frames (frames x coefficients) for a mono 16 kHz signal"""
+    n_fft = config['n_fft']
+    hop = config['hop_length']
+    if len(audio) < n_fft:
+        audio = np.pad(audio, (0, n_fft - len(audio)))
+
+    n_frames = 1 + (len(audio) - n_fft) // hop
+    indices = np.arange(n_fft)[None, :] + hop * np.arange(n_frames)[:, None]
+    frames = audio[indices] * np.hanning(n_fft).astype(np.float32)
+
+    power = np.abs(np.fft.rfft(frames, axis=1)) ** 2
+    mel = power @ _mel_filterbank(n_fft, config['n_mels']).T
+    log_mel = np.log(mel + 1e-10)
+    return log_mel @ _dct_matrix(config['n_mfcc'], config['n_mels']).T
+
+
+def segment_embeddings(audio, segments, config=DIARIZATION_CONFIG):
+    """Return (indices, embeddings) for segments long enough to embed"""
+    indices = []
+    features = []
+    for i, segment in enumerate(segments):
+        if segment['end'] - segment['start'] < config['min_segment_seconds']:
+            continue
+        start = int(segment['start'] * SAMPLE_RATE)
+        end = int(segment['end'] * SAMPLE_RATE)
+        mfcc = compute_mfcc(audio[start:end], config)[:, 1:]  # Drop energy term
+        features.append(mfcc.mean(axis=0))
+        indices.append(i)
+
+    if not features:
+        return indices, np.zeros((0, 0), dtype=np.float32)
+
+    # No per-meeting standardization: centring on the meeting's own mean turns
+    # a single speaker's segments into unrelated directions
+    embeddings = np.stack(features)
+    embeddings /= np.linalg.norm(embeddings, axis=1, keepdims=True) + 1e-10
+    return indices, embeddings
+
+
+def agglomerative_cluster(embeddings, distance_threshold, max_speakers):
+    """Cluster unit-norm embeddings with average linkage on cosine distance"""
+    n = len(embeddings)
+    if n == 0:
+        return np.zeros(0, dtype=int)
+    if n == 1:
+        return np.zeros(1, dtype=int)
+
+    dist = 1.0 - embeddings @ embeddings.T
+    np.fill_diagonal(dist, np.inf)
+    sizes = np.ones(n)
+    labels = np.arange(n)
+    clusters = n
+
+    while clusters > 1:
+        i, j = np.unravel_index(np.argmin(dist), dist.shape)
+        # The threshold decides when to stop; max_speakers only caps the count
+        if dist[i, j] > distance_threshold and clusters <= max_speakers:
+            break
+
+        # Lance-Williams update for average linkage, merging j into i
+        merged = (sizes[i] * dist[i] + sizes[j] * dist[j]) / (sizes[i] + sizes[j])
+        dist[i, :] = merged
+        dist[:, i] = merged
+        dist[i, i] = np.inf
+        dist[j, :] = np.inf
+        dist[:, j] = np.inf
+        sizes[i] += sizes[j]
+        labels[labels == j] = i
+        clusters -= 1
+
+    # Renumber clusters in order of first appearance
+    _, first_seen = np.unique(labels, return_index=True)
+    order = {labels[idx]: rank for rank, idx in enumerate(sorted(first_seen))}
+    return np.array([order[label] for label in labels])
+
+
+def assign_speakers(audio, segments, config=DIARIZATION_CONFIG):
+    """Add a "speaker" label to every segment"""
+    if not segments:
+        return segments
+
+    try:
+        indices, embeddings = segment_embeddings(audio, segments, config)
+        labels = agglomerative_cluster(
+            embeddings, config['distance_threshold'], config['max_speakers']
+        )
+        speaker_by_index = dict(zip(indices, labels))
+    except Exception as e:
+        logger.error(f"Error clustering speakers: {e}")
+        speaker_by_index = {}
+
+    # Short segments take the label of the previous (or next) embedded segment
+    current = speaker_by_index[indices[0]] if speaker_by_index else 0
+    for i, segment in enumerate(segments):
+        current = speaker_by_index.get(i, current)
+        segment['speaker'] = f"Speaker {current + 1}"
+
+    logger.info(f"Identified {len(set(s['speaker'] for s in segments))} speaker(s)")
+    return segments
+
+
+def build_speaker_turns(segments):
+    """Merge consecutive segments from the same speaker into turns"""
+    turns = []
+    for segment in segments:
+        if turns and turns[-1]['speaker'] == segment['speaker']:
+            turn = turns[-1]
+            turn['end'] = segment['end']
+            turn['text'] = f"{turn['text']} {segment['text']}".strip()
+            turn['segment_ids'].append(segment['id'])
+        else:
+            turns.append({
+                'speaker': segment['speaker'],
+                'start': segment['start'],
+                'end': segment['end'],
+                'text': segment['text'].strip(),
+                'segment_ids': [segment['id']]
+            })
+    return turns
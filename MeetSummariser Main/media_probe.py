@@ -0,0 +1,69 @@
+"""
+Duration probing for uploaded recordings.
+
+Browser recordings (Chrome's MediaRecorder WebM in particular) are written as
+a live stream and usually carry no duration in the container header, so
+ffprobe reports "N/A" for format=duration. In that case the duration is read
+from the timestamps of the audio packets, which only demuxes the file and
+does not decode it.
+"""
+import logging
+import subprocess
+
+logger = logging.getLogger(__name__)
+
+PROBE_TIMEOUT = 60  # Seconds allowed for each ffprobe call
+
+
+def _ffprobe(audio_path, *args):
+    return subprocess.run(
+        ['ffprobe', '-v', 'error', *args, audio_path],
+        capture_output=True, text=True, timeout=PROBE_TIMEOUT
+    ).stdout
+
+
+def _parse_float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def header_duration(audio_path):
+    """Return the duration stored in the container header, or None"""
+    duration = _parse_float(_ffprobe(
+        audio_path, '-show_entries', 'format=duration',
+        '-of', 'default=noprint_wrappers=1:nokey=1'
+    ).strip())
+    return duration if duration and duration > 0 else None
+
+
+def packet_duration(audio_path):
+    """Return the end time of the last audio packet, or None"""
+    output = _ffprobe(
+        audio_path, '-select_streams', 'a:0',
+        '-show_entries', 'packet=pts_time,duration_time', '-of', 'csv=p=0'
+    )
+    end = None
+    for line in output.splitlines():
+        fields = line.strip().split(',')
+        pts = _parse_float(fields[0])
+        if pts is None:
+            continue
+        length = _parse_float(fields[1]) if len(fields) > 1 else None
+        end = max(end or 0.0, pts + (length or 0.0))
+    return end if end and end > 0 else None
+
+
+def get_audio_duration(audio_path):
+    """Return the duration of an audio file in seconds, or None if it is unknown"""
+    try:
+        duration = header_duration(audio_path)
+        if duration is None:
+            duration = packet_duration(audio_path)
+        if duration is None:
+            logger.warning(f"Could not determine audio duration for {audio_path}")
+        return duration
+    except Exception as e:
+        logger.warning(f"Could not determine audio duration for {audio_path}: {e}")
+        return None
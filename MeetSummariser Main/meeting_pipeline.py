@@ -0,0 +1,381 @@
+"""
+Transcription, speaker clustering, summarization and PDF generation.
+
+Shared by the web app and the batch command. Importing this module has no
+side effects: models are passed in by the caller and nothing is created on
+disk until a function is called.
+"""
+import logging
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import whisper
+from reportlab.lib.pagesizes import letter
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.enums import TA_CENTER
+from reportlab.lib.units import inch
+from reportlab.lib.colors import HexColor
+
+from diarization import assign_speakers, build_speaker_turns
+from model_tiers import thread_summarizer
+from transcript_archive import write_archive
+
+logger = logging.getLogger(__name__)
+
+# Section summarization settings
+SUMMARY_WORKERS = int(os.environ.get('SUMMARY_WORKERS', 4))
+summary_executor = ThreadPoolExecutor(max_workers=SUMMARY_WORKERS,
+                                      thread_name_prefix="summary")
+MIN_SECTION_WORDS = 40        # Shorter sections are kept verbatim
+TOPIC_SECTION_SECONDS = 600   # Section length when only one speaker is found
+
+def transcribe_audio(audio, model):
+    """Transcribe audio using Whisper, keeping timestamped segments"""
+    try:
+        logger.info(f"Transcribing audio ({len(audio) / whisper.audio.SAMPLE_RATE:.1f}s)")
+        result = model.transcribe(audio, word_timestamps=True)
+        segments = [
+            {
+                "id": segment["id"],
+                "start": round(segment["start"], 2),
+                "end": round(segment["end"], 2),
+                "text": segment["text"].strip()
+            }
+            for segment in result["segments"]
+        ]
+        words = [
+            {
+                "text": word["word"],
+                "start": word["start"],
+                "end": word["end"],
+                "segment": index
+            }
+            for index, segment in enumerate(result["segments"])
+            for word in segment.get("words", [])
+        ]
+        return {"text": result["text"], "segments": segments, "words": words}
+    except Exception as e:
+        logger.error(f"Error transcribing audio: {e}")
+        return None
+
+def format_timestamp(seconds):
+    """Format seconds as MM:SS or HH:MM:SS"""
+    seconds = int(seconds)
+    hours, remainder = divmod(seconds, 3600)
+    minutes, secs = divmod(remainder, 60)
+    if hours:
+        return f"{hours:d}:{minutes:02d}:{secs:02d}"
+    return f"{minutes:02d}:{secs:02d}"
+
+def build_sections(segments, turns):
+    """Group the transcript into sections, one per speaker or per time window"""
+    speakers = []
+    for turn in turns:
+        if turn["speaker"] not in speakers:
+            speakers.append(turn["speaker"])
+    
+    sections = []
+    if len(speakers) > 1:
+        for speaker in speakers:
+            speaker_turns = [t for t in turns if t["speaker"] == speaker]
+            sections.append({
+                "title": speaker,
+                "speaker": speaker,
+                "start": speaker_turns[0]["start"],
+                "end": speaker_turns[-1]["end"],
+                "text": " ".join(t["text"] for t in speaker_turns)
+            })
+    else:
+        # Single speaker: split the meeting into topic sections by time
+        for segment in segments:
+            window = int(segment["start"] // TOPIC_SECTION_SECONDS)
+            if not sections or sections[-1]["window"] != window:
+                sections.append({
+                    "window": window,
+                    "speaker": segment.get("speaker"),
+                    "start": segment["start"],
+                    "end": segment["end"],
+                    "text": segment["text"]
+                })
+            else:
+                sections[-1]["end"] = segment["end"]
+                sections[-1]["text"] += " " + segment["text"]
+        if len(sections) <= 1:
+            return []
+        for section in sections:
+            del section["window"]
+            section["title"] = (f"{format_timestamp(section['start'])} - "
+                                f"{format_timestamp(section['end'])}")
+    return sections
+
+def summarize_section(section, model):
+    """Summarize one section and extract its bullet points"""
+    text = section["text"]
+    if len(text.split()) < MIN_SECTION_WORDS:
+        summary = text
+    else:
+        summary = summarize_transcript(text, model)
+    result = {key: value for key, value in section.items() if key != "text"}
+    return dict(result, summary=summary, bullet_points=extract_bullet_points(summary or ""))
+
+def summarize_sections(transcript, sections, model):
+    """Summarize every section in parallel, then summarize the section summaries"""
+    if not sections:
+        return summarize_transcript(transcript, model), []
+    
+    futures = [summary_executor.submit(summarize_section, section, model)
+               for section in sections]
+    sections = [future.result() for future in futures]
+    
+    # The overall summary is a final pass over the section summaries (in meeting
+    # order), which is much shorter than summarizing the transcript again
+    ordered = sorted(sections, key=lambda section: section["start"])
+    combined_summary = ' '.join(section["summary"] for section in ordered if section["summary"])
+    if len(combined_summary.split()) < MIN_SECTION_WORDS:
+        return combined_summary or None, sections
+    return summarize_transcript(combined_summary, model), sections
+
+def summarize_transcript(transcript, model):
+    """Summarize the transcript using the loaded summarization model"""
+    try:
+        logger.info("Summarizing transcript...")
+        
+        if model is None:
+            logger.error("Summarizer model not loaded")
+            return None
+        
+        model = thread_summarizer(model)
+        
+        max_chunk_length = 1000
+        words = transcript.split()
+        
+        if len(words) <= max_chunk_length:
+            summary = model(transcript, max_length=200, min_length=50, do_sample=False)
+            return summary[0]['summary_text']
+        else:
+            chunks = []
+            chunk_summaries = []
+            
+            for i in range(0, len(words), max_chunk_length):
+                chunk = ' '.join(words[i:i + max_chunk_length])
+                chunks.append(chunk)
+            
+            logger.info(f"Splitting transcript into {len(chunks)} chunks for summarization")
+            
+            for i, chunk in enumerate(chunks):
+                try:
+                    chunk_summary = model(chunk, max_length=150, min_length=30, do_sample=False)
+                    chunk_summaries.append(chunk_summary[0]['summary_text'])
+                    logger.info(f"Summarized chunk {i+1}/{len(chunks)}")
+                except Exception as chunk_error:
+                    logger.error(f"Error summarizing chunk {i+1}: {chunk_error}")
+                    sentences = chunk.split('.')[:3]
+                    fallback_summary = '. '.join(sentences).strip()
+                    if fallback_summary:
+                        chunk_summaries.append(fallback_summary + '.')
+            
+            combined_summary = ' '.join(chunk_summaries)
+            
+            if len(combined_summary.split()) > 300:
+                final_summary = model(combined_summary, max_length=200, min_length=50, do_sample=False)
+                return final_summary[0]['summary_text']
+            else:
+                return combined_summary
+            
+    except Exception as e:
+        logger.error(f"Error summarizing transcript: {e}")
+        sentences = transcript.split('.')[:5]
+        fallback = '. '.join(sentences).strip()
+        return fallback + '.' if fallback else transcript[:500] + "..."
+
+def extract_bullet_points(summary):
+    """Extract bullet points from the summary"""
+    try:
+        logger.info("Extracting bullet points from summary...")
+        
+        sentences = re.split(r'[.!?]+', summary)
+        sentences = [s.strip() for s in sentences if s.strip()]
+        
+        bullet_points = []
+        
+        for sentence in sentences:
+            if len(sentence.split()) < 3:
+                continue
+            
+            sentence = sentence.strip()
+            
+            if len(sentence) > 1:
+                sentence = sentence[0].upper() + sentence[1:]
+            
+            if not sentence.endswith(('.', '!', '?')):
+                sentence += '.'
+            
+            bullet_points.append(sentence)
+        
+        bullet_points = bullet_points[:10]
+        
+        if not bullet_points and summary:
+            parts = re.split(r'\b(and|also|furthermore|additionally|moreover|however|but|while)\b', summary)
+            for part in parts:
+                part = part.strip()
+                if len(part.split()) >= 5 and part not in ['and', 'also', 'furthermore', 'additionally', 'moreover', 'however', 'but', 'while']:
+                    if len(part) > 1:
+                        part = part[0].upper() + part[1:]
+                    if not part.endswith(('.', '!', '?')):
+                        part += '.'
+                    bullet_points.append(part)
+                    if len(bullet_points) >= 8:
+                        break
+        
+        logger.info(f"Extracted {len(bullet_points)} bullet points")
+        return bullet_points
+        
+    except Exception as e:
+        logger.error(f"Error extracting bullet points: {e}")
+        sentences = summary.split('.')[:5] if summary else ["No bullet points could be extracted."]
+        return [s.strip() + '.' for s in sentences if s.strip()]
+
+def create_bullet_points_pdf(bullet_points, filename, sections=None):
+    """Create PDF with bullet points, optionally grouped by section"""
+    try:
+        logger.info(f"Creating bullet points PDF: {filename}")
+        
+        doc = SimpleDocTemplate(filename, pagesize=letter, 
+                              leftMargin=0.75*inch, rightMargin=0.75*inch,
+                              topMargin=1*inch, bottomMargin=1*inch)
+        styles = getSampleStyleSheet()
+        story = []
+        
+        title_style = ParagraphStyle(
+            'CustomTitle',
+            parent=styles['Heading1'],
+            fontSize=28,
+            textColor=HexColor('#1a365d'),
+            alignment=TA_CENTER,
+            spaceAfter=40,
+            fontName='Helvetica-Bold'
+        )
+        
+        subtitle_style = ParagraphStyle(
+            'CustomSubtitle',
+            parent=styles['Normal'],
+            fontSize=12,
+            textColor=HexColor('#4a5568'),
+            alignment=TA_CENTER,
+            spaceAfter=30,
+            fontName='Helvetica'
+        )
+        
+        bullet_style = ParagraphStyle(
+            'BulletStyle',
+            parent=styles['Normal'],
+            fontSize=12,
+            textColor=HexColor('#2d3748'),
+            leftIndent=0,
+            spaceBefore=8,
+            spaceAfter=8,
+            fontName='Helvetica',
+            leading=18
+        )
+        
+        story.append(Paragraph("📋 Meeting Summary - Key Points", title_style))
+        story.append(Paragraph(
+            f"Generated on {datetime.now().strftime('%B %d, %Y at %I:%M %p')}", 
+            subtitle_style
+        ))
+        story.append(Spacer(1, 0.3*inch))
+        
+        if bullet_points:
+            for i, point in enumerate(bullet_points, 1):
+                formatted_point = f"• {point}"
+                story.append(Paragraph(formatted_point, bullet_style))
+        else:
+            story.append(Paragraph("• No key points could be extracted from the recording.", bullet_style))
+        
+        if sections:
+            section_style = ParagraphStyle(
+                'SectionHeading',
+                parent=styles['Heading2'],
+                fontSize=16,
+                textColor=HexColor('#1a365d'),
+                spaceBefore=20,
+                spaceAfter=10,
+                fontName='Helvetica-Bold'
+            )
+            
+            for section in sections:
+                heading = section["title"]
+                if section.get("speaker") == heading:
+                    heading += (f" ({format_timestamp(section['start'])} - "
+                                f"{format_timestamp(section['end'])})")
+                story.append(Paragraph(heading, section_style))
+                for point in section["bullet_points"]:
+                    story.append(Paragraph(f"• {point}", bullet_style))
+        
+        story.append(Spacer(1, 0.5*inch))
+        
+        footer_style = ParagraphStyle(
+            'Footer',
+            parent=styles['Normal'],
+            fontSize=10,
+            textColor=HexColor('#718096'),
+            alignment=TA_CENTER,
+            fontName='Helvetica-Oblique'
+        )
+        
+        story.append(Paragraph("Generated by Google Meet Recorder", footer_style))
+        
+        doc.build(story)
+        logger.info(f"Bullet points PDF created successfully: {filename}")
+        return True
+        
+    except Exception as e:
+        logger.error(f"Error creating bullet points PDF: {e}")
+        return False
+
+def analyze_audio(audio, models):
+    """Transcribe, diarize and summarize decoded 16 kHz audio"""
+    asr_model, summary_model = models
+    
+    transcription = transcribe_audio(audio, asr_model)
+    if transcription is None:
+        return {"error": "Failed to transcribe audio"}
+    
+    logger.info("Transcription completed")
+    
+    segments = assign_speakers(audio, transcription["segments"])
+    speaker_turns = build_speaker_turns(segments)
+    sections = build_sections(segments, speaker_turns)
+    
+    summary, sections = summarize_sections(transcription["text"], sections, summary_model)
+    if summary is None:
+        return {"error": "Failed to summarize transcript"}
+    
+    logger.info(f"Summarization completed ({len(sections)} sections)")
+    
+    bullet_points = extract_bullet_points(summary)
+    logger.info(f"Extracted {len(bullet_points)} bullet points")
+    
+    return {
+        "success": True,
+        "transcription": transcription["text"],
+        "segments": segments,
+        "speaker_turns": speaker_turns,
+        "sections": sections,
+        "summary": summary,
+        "bullet_points": bullet_points,
+        "words": transcription["words"]
+    }
+
+def archive_transcript(result, path):
+    """Move the word timings out of a result into a compact transcript archive"""
+    words = result.pop("words", [])
+    try:
+        write_archive(path, result["segments"], words)
+        return True
+    except Exception as e:
+        logger.error(f"Error writing transcript archive {path}: {e}")
+        return False
@@ -0,0 +1,138 @@
+"""
+Model tiers and the policy that picks one for each job.
+
+Each tier pairs a Whisper model with a summarization model. Tiers are loaded
+lazily (or preloaded at startup) and cached, so several can stay in memory.
+The policy picks a tier from the recording duration, the current queue
+backlog and a caller-supplied hint, degrading to faster models under load so
+latency stays bounded.
+"""
+import copy
+import logging
+import os
+import threading
+
+import whisper
+from transformers import pipeline
+
+logger = logging.getLogger(__name__)
+
+# Tiers from fastest to highest quality
+TIER_ORDER = ['fast', 'balanced', 'quality']
+
+MODEL_TIERS = {
+    'fast': {'whisper': 'tiny', 'summarizer': 'sshleifer/distilbart-cnn-12-6'},
+    'balanced': {'whisper': 'base', 'summarizer': 'sshleifer/distilbart-cnn-12-6'},
+    'quality': {'whisper': 'base', 'summarizer': 'facebook/bart-large-cnn'},
+}
+
+DEFAULT_TIER = 'quality'
+
+# Hints a caller can pass, besides an explicit tier name. "quality" is a hint
+# (best tier, degraded only under heavy load) rather than a pinned tier.
+QUALITY_HINTS = ('auto', 'quality', 'latency')
+
+TIER_POLICY = {
+    'long_recording_seconds': 3600,   # Longer recordings use at most "balanced"
+    'degrade_backlog_seconds': 300,   # Drop one tier above this backlog
+    'critical_backlog_seconds': 900,  # Drop two tiers above this backlog
+}
+
+# Per-thread summarization pipelines, keyed by the shared pipeline's id
+_thread_summarizers = threading.local()
+
+
+def thread_summarizer(summarizer):
+    """Return this thread's copy of a summarization pipeline
+
+    Fast tokenizers must not be called from several threads at once, so each
+    thread gets its own tokenizer while the model weights stay shared.
+    """
+    cache = getattr(_thread_summarizers, 'cache', None)
+    if cache is None:
+        cache = _thread_summarizers.cache = {}
+    if id(summarizer) not in cache:
+        cache[id(summarizer)] = pipeline(
+            "summarization",
+            model=summarizer.model,
+            tokenizer=copy.deepcopy(summarizer.tokenizer),
+            device=summarizer.device
+        )
+    return cache[id(summarizer)]
+
+
+class ModelManager:
+    """Loads and caches the models used by each tier"""
+
+    def __init__(self, tiers=MODEL_TIERS, policy=TIER_POLICY):
+        self.tiers = tiers
+        self.policy = policy
+        self._whisper_models = {}
+        self._summarizers = {}
+        self._lock = threading.Lock()
+        self._device = None
+
+    def _summarizer_device(self):
+        if self._device is None:
+            self._device = 0 if os.system("nvidia-smi") == 0 else -1
+        return self._device
+
+    def get(self, tier):
+        """Return (whisper model, summarizer) for a tier, loading them if needed"""
+        config = self.tiers[tier]
+        if self.is_loaded(tier):
+            return (self._whisper_models[config['whisper']],
+                    self._summarizers[config['summarizer']])
+
+        with self._lock:
+            if config['whisper'] not in self._whisper_models:
+                logger.info(f"Loading Whisper model '{config['whisper']}' for tier {tier}...")
+                self._whisper_models[config['whisper']] = whisper.load_model(config['whisper'])
+            if config['summarizer'] not in self._summarizers:
+                logger.info(f"Loading summarization model '{config['summarizer']}' "
+                            f"for tier {tier}...")
+                self._summarizers[config['summarizer']] = pipeline(
+                    "summarization",
+                    model=config['summarizer'],
+                    device=self._summarizer_device()
+                )
+            return (self._whisper_models[config['whisper']],
+                    self._summarizers[config['summarizer']])
+
+    def is_loaded(self, tier):
+        """Return True if both models of a tier are already in memory"""
+        config = self.tiers[tier]
+        return (config['whisper'] in self._whisper_models
+                and config['summarizer'] in self._summarizers)
+
+    def loaded_tiers(self):
+        """Return the names of tiers whose models are in memory"""
+        return [tier for tier in TIER_ORDER if self.is_loaded(tier)]
+
+    def choose_tier(self, duration, backlog_seconds, hint='auto'):
+        """Pick a tier for a job, returning (tier, reason)"""
+        if hint in self.tiers and hint not in QUALITY_HINTS:
+            return hint, "requested"
+
+        if hint == 'latency':
+            return 'fast', "latency hint"
+
+        level = TIER_ORDER.index(DEFAULT_TIER)
+        reason = "default"
+        if hint != 'quality' and duration and duration > self.policy['long_recording_seconds']:
+            level = min(level, TIER_ORDER.index('balanced'))
+            reason = "long recording"
+
+        # Degrade under load; a quality hint tolerates one extra level of backlog
+        steps = 0
+        if backlog_seconds > self.policy['critical_backlog_seconds']:
+            steps = 2
+        elif backlog_seconds > self.policy['degrade_backlog_seconds']:
+            steps = 1
+        if hint == 'quality':
+            steps = max(steps - 1, 0)
+        if steps:
+            level = max(level - steps, 0)
+            reason = f"queue backlog {backlog_seconds:.0f}s"
+
+        return TIER_ORDER[level], reason
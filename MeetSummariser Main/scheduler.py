@@ -0,0 +1,354 @@
+"""
+Fair multi-tenant scheduler for the transcription and summarization work.
+
+Every tenant (user) gets its own queue. Jobs are ordered with weighted fair
+queueing: each job gets a virtual finish tag based on its estimated cost and
+the tenant's weight, so a user who uploads ten long recordings cannot starve
+everyone else. Short recordings go into a priority class that is dispatched
+before normal jobs, which keeps interactive latency low. Normal jobs that have
+waited longer than max_normal_wait are promoted ahead of the short class, so a
+steady stream of short uploads cannot hold back long recordings forever.
+"""
+import logging
+import threading
+import time
+import uuid
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+# Priority classes (lower value is dispatched first)
+PRIORITY_AGED = -1      # Normal jobs that have waited too long
+PRIORITY_SHORT = 0
+PRIORITY_NORMAL = 1
+
+# Default scheduler settings
+SCHEDULER_CONFIG = {
+    'workers': 1,                    # Jobs processed at the same time
+    'max_running_per_tenant': 1,     # Concurrency cap per user
+    'max_queued_per_tenant': 10,     # Queued jobs allowed per user
+    'max_queued': 200,               # Queued jobs allowed in total
+    'short_threshold': 600,          # Recordings up to 10 minutes are "short"
+    'max_normal_wait': 900,          # Normal jobs then go ahead of short ones
+    'default_duration': 300,         # Assumed duration when it is unknown
+    'initial_rate': 0.5,             # Processing seconds per second of audio
+    'job_ttl': 3600,                 # Keep finished jobs for 1 hour
+}
+
+
+class AdmissionError(Exception):
+    """Raised when a job is rejected by admission control"""
+
+    def __init__(self, message, position=None, eta=None):
+        super().__init__(message)
+        self.position = position
+        self.eta = eta
+
+
+class Job:
+    """A unit of work submitted to the scheduler"""
+
+    def __init__(self, tenant, func, args, kwargs, duration, priority, cost):
+        self.id = str(uuid.uuid4())
+        self.tenant = tenant
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.duration = duration
+        self.priority = priority
+        self.cost = cost
+        self.start_tag = 0.0
+        self.finish_tag = 0.0
+        self.seq = 0
+        self.status = 'queued'
+        self.result = None
+        self.error = None
+        self.submitted_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self._done = threading.Event()
+        self._callbacks = []
+        self._callbacks_lock = threading.Lock()
+
+    def sort_key(self):
+        """Dispatch order: priority class, then virtual finish tag"""
+        return (self.priority, self.finish_tag, self.seq)
+
+    def wait(self, timeout=None):
+        """Block until the job has finished"""
+        return self._done.wait(timeout)
+
+    def add_done_callback(self, callback):
+        """Call callback(job) once the job has finished (immediately if it already has)"""
+        with self._callbacks_lock:
+            if not self._done.is_set():
+                self._callbacks.append(callback)
+                return
+        callback(self)
+
+    def _set_done(self):
+        with self._callbacks_lock:
+            self._done.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            try:
+                callback(self)
+            except Exception as e:
+                logger.error(f"Error in done callback for job {self.id}: {e}")
+
+    def to_dict(self):
+        """Return a JSON-friendly view of the job"""
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "priority": "short" if self.priority == PRIORITY_SHORT else "normal",
+            "duration": self.duration,
+            "submitted_at": self.submitted_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "error": self.error
+        }
+
+
+class FairScheduler:
+    """Weighted fair scheduler with per-tenant queues and concurrency caps"""
+
+    def __init__(self, config=None, weights=None):
+        self.config = dict(SCHEDULER_CONFIG)
+        if config:
+            self.config.update(config)
+        self.weights = weights or {}
+
+        self._cond = threading.Condition()
+        self._queues = {}           # tenant -> {priority: deque of jobs}
+        self._last_finish = {}      # tenant -> last virtual finish tag
+        self._running = {}          # tenant -> number of running jobs
+        self._running_jobs = set()
+        self._jobs = {}             # job id -> job
+        self._queued = 0
+        self._vtime = 0.0
+        self._seq = 0
+        self._rate = self.config['initial_rate']
+        self._threads = []
+        self._stopping = False
+
+    def start(self):
+        """Start the worker threads"""
+        with self._cond:
+            if self._threads:
+                return
+            self._stopping = False
+            for i in range(self.config['workers']):
+                thread = threading.Thread(
+                    target=self._worker, name=f"scheduler-worker-{i}", daemon=True
+                )
+                thread.start()
+                self._threads.append(thread)
+        logger.info(f"Scheduler started with {self.config['workers']} worker(s)")
+
+    def stop(self):
+        """Stop the worker threads once they finish their current job"""
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+    def estimate_cost(self, duration):
+        """Estimate processing seconds for a recording of the given duration"""
+        if duration is None:
+            duration = self.config['default_duration']
+        return max(duration, 1.0) * self._rate
+
+    def submit(self, tenant, func, *args, duration=None, **kwargs):
+        """Queue a job for a tenant, raising AdmissionError if it is rejected"""
+        with self._cond:
+            self._prune()
+
+            tenant_queued = sum(len(q) for q in self._queues.get(tenant, {}).values())
+            if tenant_queued >= self.config['max_queued_per_tenant']:
+                raise AdmissionError(
+                    "Too many queued jobs for this user",
+                    position=tenant_queued,
+                    eta=self._tenant_backlog(tenant)
+                )
+            if self._queued >= self.config['max_queued']:
+                raise AdmissionError(
+                    "Server is busy, please try again later",
+                    position=self._queued,
+                    eta=self._total_backlog()
+                )
+
+            if duration is not None and duration <= self.config['short_threshold']:
+                priority = PRIORITY_SHORT
+            else:
+                priority = PRIORITY_NORMAL
+
+            job = Job(tenant, func, args, kwargs, duration, priority,
+                      self.estimate_cost(duration))
+
+            weight = self.weights.get(tenant, 1.0)
+            job.start_tag = max(self._vtime, self._last_finish.get(tenant, 0.0))
+            job.finish_tag = job.start_tag + job.cost / weight
+            job.seq = self._seq
+            self._seq += 1
+            self._last_finish[tenant] = job.finish_tag
+
+            queues = self._queues.setdefault(
+                tenant, {PRIORITY_SHORT: deque(), PRIORITY_NORMAL: deque()}
+            )
+            queues[priority].append(job)
+            self._jobs[job.id] = job
+            self._queued += 1
+            self._cond.notify()
+
+        logger.info(f"Queued job {job.id} for tenant {tenant} "
+                    f"(priority={priority}, duration={duration})")
+        return job
+
+    def get(self, job_id):
+        """Return a job by id, or None if it is unknown"""
+        with self._cond:
+            return self._jobs.get(job_id)
+
+    def position(self, job):
+        """Return the 1-based queue position of a job, or 0 if not queued"""
+        with self._cond:
+            if job.status != 'queued':
+                return 0
+            return len(self._jobs_ahead(job)) + 1
+
+    def eta(self, job):
+        """Estimate seconds until the job finishes"""
+        with self._cond:
+            if job.status in ('done', 'failed'):
+                return 0.0
+            if job.status == 'running':
+                return max(job.cost - (time.time() - job.started_at), 0.0)
+            ahead = self._jobs_ahead(job)
+            global_wait = (sum(j.cost for j in ahead)
+                           + self._running_remaining()) / self.config['workers']
+            # The tenant's own jobs run at most max_running_per_tenant at a time
+            own_ahead = sum(j.cost for j in ahead if j.tenant == job.tenant)
+            tenant_wait = ((own_ahead + self._running_remaining(job.tenant))
+                           / self._tenant_concurrency())
+            return max(global_wait, tenant_wait) + job.cost
+
+    def queue_depth(self):
+        """Return the number of queued jobs and their estimated seconds of work"""
+        with self._cond:
+            return self._queued, self._total_backlog()
+
+    def stats(self):
+        """Return scheduler statistics for the health endpoint"""
+        with self._cond:
+            return {
+                "workers": self.config['workers'],
+                "queued": self._queued,
+                "running": len(self._running_jobs),
+                "tenants": len([t for t, q in self._queues.items()
+                                if any(q.values())]),
+                "backlog_seconds": round(self._total_backlog(), 1),
+                "seconds_per_audio_second": round(self._rate, 3)
+            }
+
+    def _dispatch_key(self, job, now):
+        """Sort key of a queued job, promoting normal jobs that waited too long"""
+        if (job.priority == PRIORITY_NORMAL
+                and now - job.submitted_at >= self.config['max_normal_wait']):
+            return (PRIORITY_AGED, job.finish_tag, job.seq)
+        return job.sort_key()
+
+    def _jobs_ahead(self, job):
+        """Return queued jobs that will be dispatched before the given job"""
+        now = time.time()
+        key = self._dispatch_key(job, now)
+        ahead = []
+        for queues in self._queues.values():
+            for q in queues.values():
+                for other in q:
+                    if other is not job and self._dispatch_key(other, now) < key:
+                        ahead.append(other)
+        return ahead
+
+    def _running_remaining(self, tenant=None):
+        now = time.time()
+        return sum(max(j.cost - (now - j.started_at), 0.0) for j in self._running_jobs
+                   if tenant is None or j.tenant == tenant)
+
+    def _tenant_concurrency(self):
+        return max(min(self.config['max_running_per_tenant'], self.config['workers']), 1)
+
+    def _tenant_backlog(self, tenant):
+        """Estimate seconds until all of a tenant's queued and running work is done"""
+        queued = sum(j.cost for q in self._queues.get(tenant, {}).values() for j in q)
+        tenant_wait = (queued + self._running_remaining(tenant)) / self._tenant_concurrency()
+        return max(self._total_backlog(), tenant_wait)
+
+    def _total_backlog(self):
+        queued = sum(j.cost for queues in self._queues.values()
+                     for q in queues.values() for j in q)
+        return (queued + self._running_remaining()) / self.config['workers']
+
+    def _next_job(self):
+        """Pick the eligible job with the smallest (priority, finish tag)"""
+        now = time.time()
+        best = best_key = None
+        for tenant, queues in self._queues.items():
+            if self._running.get(tenant, 0) >= self.config['max_running_per_tenant']:
+                continue
+            for q in queues.values():
+                if q:
+                    key = self._dispatch_key(q[0], now)
+                    if best is None or key < best_key:
+                        best, best_key = q[0], key
+        if best is not None:
+            self._queues[best.tenant][best.priority].popleft()
+            self._queued -= 1
+        return best
+
+    def _worker(self):
+        while True:
+            with self._cond:
+                job = self._next_job()
+                while job is None and not self._stopping:
+                    self._cond.wait()
+                    job = self._next_job()
+                if job is None:
+                    return
+                self._vtime = max(self._vtime, job.start_tag)
+                self._running[job.tenant] = self._running.get(job.tenant, 0) + 1
+                self._running_jobs.add(job)
+                job.status = 'running'
+                job.started_at = time.time()
+
+            try:
+                job.result = job.func(*job.args, **job.kwargs)
+                job.status = 'done'
+            except Exception as e:
+                logger.error(f"Job {job.id} failed: {e}")
+                job.error = str(e)
+                job.status = 'failed'
+
+            with self._cond:
+                job.finished_at = time.time()
+                self._running[job.tenant] -= 1
+                self._running_jobs.discard(job)
+                if job.duration:
+                    # Track processing speed with an exponential moving average
+                    observed = (job.finished_at - job.started_at) / job.duration
+                    self._rate = 0.8 * self._rate + 0.2 * observed
+                self._cond.notify_all()
+            job._set_done()
+
+    def _prune(self):
+        """Forget finished jobs older than the configured TTL"""
+        cutoff = time.time() - self.config['job_ttl']
+        expired = [job_id for job_id, job in self._jobs.items()
+                   if job.finished_at and job.finished_at < cutoff]
+        for job_id in expired:
+            del self._jobs[job_id]
+        for tenant in [t for t, q in self._queues.items()
+                       if not any(q.values()) and not self._running.get(t)]:
+            del self._queues[tenant]
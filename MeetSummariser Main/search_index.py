@@ -0,0 +1,283 @@
+"""
+Search index over past meeting transcripts, summaries and bullet points.
+
+Text search uses an on-disk SQLite FTS5 inverted index ranked with BM25.
+Optionally every document also gets a hashed bag-of-words vector that is
+appended to a float32 matrix on disk; the matrix is memory-mapped with NumPy
+for cosine similarity search. Meetings are added incrementally as jobs finish,
+and several processes (the server and batch.py) may write to the same index:
+SQLite's write lock serializes them, and the committed vector_row values, not
+the file size, decide where the next vector goes.
+"""
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+VECTOR_DIM = 512
+TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meetings (
+    meeting_id TEXT PRIMARY KEY,
+    created_at REAL NOT NULL,
+    pdf_path TEXT,
+    archive_path TEXT
+);
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY,
+    meeting_id TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    speaker TEXT,
+    start REAL,
+    end REAL,
+    content TEXT NOT NULL,
+    vector_row INTEGER
+);
+CREATE INDEX IF NOT EXISTS documents_vector_row ON documents(vector_row);
+CREATE VIRTUAL TABLE IF NOT EXISTS documents_fts USING fts5(
+    content,
+    content='documents',
+    content_rowid='id',
+    tokenize='porter unicode61'
+);
+"""
+
+
+def tokenize(text):
+    """Split text into lowercase word tokens"""
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def embed_text(text, dim=VECTOR_DIM):
+    """Return an L2-normalised hashed bag-of-words vector for the text"""
+    vector = np.zeros(dim, dtype=np.float32)
+    tokens = tokenize(text)
+    features = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+    for feature in features:
+        h = zlib.crc32(feature.encode("utf-8"))
+        vector[h % dim] += 1.0 if (h >> 31) & 1 else -1.0
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+def fts_query(query):
+    """Turn free text into a safe FTS5 query (all terms must match)"""
+    return " ".join(f'"{token}"' for token in tokenize(query))
+
+
+class SearchIndex:
+    """Incrementally updated full-text and vector index of meetings"""
+
+    def __init__(self, index_dir, enable_vectors=True, dim=VECTOR_DIM):
+        self.index_dir = index_dir
+        self.db_path = os.path.join(index_dir, "meetings.db")
+        self.vectors_path = os.path.join(index_dir, "embeddings.f32")
+        self.enable_vectors = enable_vectors
+        self.dim = dim
+
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        self._matrix = None
+        self._matrix_rows = 0
+
+        os.makedirs(index_dir, exist_ok=True)
+        conn = self._connect()
+        conn.executescript(SCHEMA)
+        columns = [row["name"] for row in conn.execute("PRAGMA table_info(meetings)")]
+        if "archive_path" not in columns:
+            conn.execute("ALTER TABLE meetings ADD COLUMN archive_path TEXT")
+        conn.commit()
+
+    def _connect(self):
+        """Return this thread's SQLite connection"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def add_meeting(self, meeting_id, result):
+        """Index the transcript segments, summaries and bullet points of a meeting"""
+        documents = []
+        for segment in result.get("segments", []):
+            documents.append(("segment", segment.get("speaker"),
+                              segment["start"], segment["end"], segment["text"]))
+        if result.get("summary"):
+            documents.append(("summary", None, None, None, result["summary"]))
+        for point in result.get("bullet_points", []):
+            documents.append(("bullet_point", None, None, None, point))
+        for section in result.get("sections", []):
+            for point in section.get("bullet_points", []):
+                documents.append(("section", section.get("speaker"),
+                                  section["start"], section["end"], point))
+        documents = [doc for doc in documents if doc[4] and doc[4].strip()]
+
+        with self._write_lock:
+            conn = self._connect()
+            with conn:
+                # Take the database write lock before choosing vector rows, so
+                # other processes appending to this index wait for us
+                conn.execute("BEGIN IMMEDIATE")
+                exists = conn.execute(
+                    "SELECT 1 FROM meetings WHERE meeting_id = ?", (meeting_id,)
+                ).fetchone()
+                if exists:
+                    logger.info(f"Meeting {meeting_id} is already indexed")
+                    return 0
+
+                vector_row = None
+                if self.enable_vectors:
+                    vector_row = self._committed_vectors(conn)
+                    self._trim_vectors(vector_row)
+                vectors = []
+                conn.execute(
+                    "INSERT INTO meetings (meeting_id, created_at, pdf_path, archive_path) "
+                    "VALUES (?, ?, ?, ?)",
+                    (meeting_id, time.time(), result.get("pdf_path"), result.get("archive_path"))
+                )
+                for kind, speaker, start, end, content in documents:
+                    cursor = conn.execute(
+                        "INSERT INTO documents (meeting_id, kind, speaker, start, end, "
+                        "content, vector_row) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        (meeting_id, kind, speaker, start, end, content, vector_row)
+                    )
+                    conn.execute(
+                        "INSERT INTO documents_fts (rowid, content) VALUES (?, ?)",
+                        (cursor.lastrowid, content)
+                    )
+                    if self.enable_vectors:
+                        vectors.append(embed_text(content, self.dim))
+                        vector_row += 1
+
+                if vectors:
+                    # Append rows before the transaction commits so that
+                    # committed documents always have their vector on disk
+                    with open(self.vectors_path, "ab") as f:
+                        f.write(np.stack(vectors).astype(np.float32).tobytes())
+
+        logger.info(f"Indexed {len(documents)} documents for meeting {meeting_id}")
+        return len(documents)
+
+    def meeting_files(self, meeting_id):
+        """Return the stored pdf_path and archive_path of a meeting, or None"""
+        row = self._connect().execute(
+            "SELECT pdf_path, archive_path FROM meetings WHERE meeting_id = ?", (meeting_id,)
+        ).fetchone()
+        return dict(row) if row else None
+
+    def search(self, query, limit=10, mode="text"):
+        """Return ranked hits for a query using "text" or "semantic" mode"""
+        if mode == "semantic":
+            return self._search_vectors(query, limit)
+
+        match = fts_query(query)
+        if not match:
+            return []
+        rows = self._connect().execute(
+            """
+            SELECT d.id, d.meeting_id, d.kind, d.speaker, d.start, d.end, d.content,
+                   m.created_at, m.pdf_path,
+                   bm25(documents_fts) AS score,
+                   snippet(documents_fts, 0, '<b>', '</b>', '...', 16) AS snippet
+            FROM documents_fts
+            JOIN documents d ON d.id = documents_fts.rowid
+            JOIN meetings m ON m.meeting_id = d.meeting_id
+            WHERE documents_fts MATCH ?
+            ORDER BY score
+            LIMIT ?
+            """,
+            (match, limit)
+        ).fetchall()
+        # bm25() returns lower-is-better scores, flip them for the response
+        return [self._hit(row, -row["score"], row["snippet"]) for row in rows]
+
+    def _search_vectors(self, query, limit):
+        if not self.enable_vectors:
+            return []
+        matrix = self._load_matrix()
+        if matrix is None or not len(matrix):
+            return []
+
+        scores = matrix @ embed_text(query, self.dim)
+        k = min(limit, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        top = [int(i) for i in top if scores[i] > 0]
+        if not top:
+            return []
+
+        placeholders = ",".join("?" * len(top))
+        rows = self._connect().execute(
+            f"""
+            SELECT d.id, d.meeting_id, d.kind, d.speaker, d.start, d.end, d.content,
+                   d.vector_row, m.created_at, m.pdf_path
+            FROM documents d
+            JOIN meetings m ON m.meeting_id = d.meeting_id
+            WHERE d.vector_row IN ({placeholders})
+            """,
+            top
+        ).fetchall()
+        by_row = {row["vector_row"]: row for row in rows}
+        return [self._hit(by_row[i], float(scores[i]), by_row[i]["content"])
+                for i in top if i in by_row]
+
+    @staticmethod
+    def _committed_vectors(conn):
+        """Return the number of vector rows referenced by committed documents"""
+        last = conn.execute("SELECT MAX(vector_row) FROM documents").fetchone()[0]
+        return 0 if last is None else last + 1
+
+    def _trim_vectors(self, rows):
+        """Drop vectors past the committed rows, left by a failed or partial append"""
+        expected = rows * self.dim * 4
+        size = os.path.getsize(self.vectors_path) if os.path.exists(self.vectors_path) else 0
+        if size < expected:
+            raise RuntimeError(f"{self.vectors_path} is missing committed vectors "
+                               f"({size} of {expected} bytes)")
+        if size > expected:
+            logger.warning(f"Discarding {size - expected} bytes of uncommitted vectors")
+            os.truncate(self.vectors_path, expected)
+
+    def _load_matrix(self):
+        """Memory-map the committed embedding rows, remapping when they have grown"""
+        rows = self._committed_vectors(self._connect())
+        if rows and rows != self._matrix_rows:
+            self._matrix = np.memmap(self.vectors_path, dtype=np.float32, mode="r",
+                                     shape=(rows, self.dim))
+            self._matrix_rows = rows
+        return self._matrix
+
+    @staticmethod
+    def _hit(row, score, snippet):
+        return {
+            "meeting_id": row["meeting_id"],
+            "kind": row["kind"],
+            "speaker": row["speaker"],
+            "start": row["start"],
+            "end": row["end"],
+            "text": row["content"],
+            "snippet": snippet,
+            "score": round(score, 4),
+            "meeting_date": row["created_at"],
+            "pdf_path": row["pdf_path"]
+        }
+
+    def stats(self):
+        """Return index size information for the health endpoint"""
+        conn = self._connect()
+        return {
+            "meetings": conn.execute("SELECT COUNT(*) FROM meetings").fetchone()[0],
+            "documents": conn.execute("SELECT COUNT(*) FROM documents").fetchone()[0],
+            "vectors": self._committed_vectors(conn) if self.enable_vectors else 0
+        }
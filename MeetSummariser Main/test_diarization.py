@@ -0,0 +1,57 @@
+import numpy as np
+
+from diarization import SAMPLE_RATE, agglomerative_cluster, assign_speakers, build_speaker_turns
+
+
+def synthetic_voice(f0, formants, seconds, rng):
+    """Harmonic "speech" whose vowel formants and pitch change every 250 ms"""
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    signal = np.zeros_like(t)
+    step = SAMPLE_RATE // 4
+    for start in range(0, len(t), step):
+        vowel = [f * rng.uniform(0.75, 1.3) for f in formants]
+        pitch = f0 * rng.uniform(0.85, 1.15)
+        tt = t[start:start + step]
+        for k in range(1, 60):
+            fk = k * pitch
+            if fk > 7000:
+                break
+            amp = sum(np.exp(-((fk - f) / 120) ** 2) for f in vowel) + 0.03
+            signal[start:start + step] += amp * np.sin(2 * np.pi * fk * tt) / np.sqrt(k)
+    gain = rng.uniform(0.03, 0.3)
+    return (gain * signal + 0.003 * rng.standard_normal(len(t))).astype(np.float32)
+
+
+VOICE_A = (115, [550, 1600, 2500])
+VOICE_B = (220, [750, 1900, 3000])
+
+
+def diarize(voices, count, seed):
+    rng = np.random.default_rng(seed)
+    audio, segments = [], []
+    for i in range(count):
+        f0, formants = voices[i % len(voices)]
+        audio.append(synthetic_voice(f0, formants, 3, rng))
+        segments.append({'id': i, 'start': 3.0 * i, 'end': 3.0 * i + 3, 'text': f'w{i}'})
+    return assign_speakers(np.concatenate(audio), segments)
+
+
+def test_single_voice_is_one_speaker():
+    for seed in range(3):
+        segments = diarize([VOICE_A], 30, seed)
+        assert {s['speaker'] for s in segments} == {'Speaker 1'}
+        assert len(build_speaker_turns(segments)) == 1
+
+
+def test_two_voices_are_two_speakers():
+    for seed in range(3):
+        segments = diarize([VOICE_A, VOICE_B], 30, seed)
+        speakers = [s['speaker'] for s in segments]
+        assert speakers == ['Speaker 1', 'Speaker 2'] * 15
+
+
+def test_max_speakers_caps_cluster_count():
+    rng = np.random.default_rng(0)
+    embeddings = rng.standard_normal((200, 19))
+    embeddings /= np.linalg.norm(embeddings, axis=1, keepdims=True)
+    assert len(set(agglomerative_cluster(embeddings, 0.25, 4))) == 4
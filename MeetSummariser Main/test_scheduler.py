@@ -0,0 +1,173 @@
+import shutil
+import subprocess
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+import media_probe
+from scheduler import AdmissionError, FairScheduler, PRIORITY_SHORT
+
+
+def fake_ffprobe(format_output, packet_output):
+    """Stand-in for subprocess.run answering the two ffprobe queries"""
+    def run(cmd, **kwargs):
+        if 'format=duration' in cmd:
+            return SimpleNamespace(stdout=format_output)
+        return SimpleNamespace(stdout=packet_output)
+    return run
+
+
+# A MediaRecorder WebM: no duration in the header, timestamps on every packet
+RECORDER_PACKETS = "".join(f"{i * 0.02:.6f},N/A\n" for i in range(2000)) + "40.000000,0.020000\n"
+
+
+def test_duration_without_header_comes_from_packets(monkeypatch):
+    monkeypatch.setattr(media_probe.subprocess, 'run', fake_ffprobe("N/A\n", RECORDER_PACKETS))
+    assert media_probe.get_audio_duration("upload.webm") == pytest.approx(40.02)
+
+
+def test_duration_from_header_skips_packet_scan(monkeypatch):
+    monkeypatch.setattr(media_probe.subprocess, 'run', fake_ffprobe("12.5\n", ""))
+    assert media_probe.get_audio_duration("upload.webm") == 12.5
+
+
+def test_duration_less_upload_is_scheduled_by_its_length(monkeypatch):
+    monkeypatch.setattr(media_probe.subprocess, 'run', fake_ffprobe("N/A\n", RECORDER_PACKETS))
+    scheduler = FairScheduler({'initial_rate': 0.5})
+    job = scheduler.submit('alice', lambda: None,
+                           duration=media_probe.get_audio_duration("upload.webm"))
+
+    assert job.priority == PRIORITY_SHORT
+    assert job.cost == pytest.approx(40.02 * 0.5)
+
+    # A known duration lets the processing rate learn from finished jobs
+    scheduler.start()
+    job.wait(5)
+    scheduler.stop()
+    assert job.status == 'done'
+    assert scheduler.stats()['seconds_per_audio_second'] < 0.5
+
+
+def dispatch_order(scheduler):
+    """Names of queued jobs in the order the workers would take them"""
+    order = []
+    with scheduler._cond:
+        job = scheduler._next_job()
+        while job is not None:
+            order.append(job.args[0])
+            job = scheduler._next_job()
+    return order
+
+
+def submit(scheduler, tenant, name, duration):
+    return scheduler.submit(tenant, lambda name: name, name, duration=duration)
+
+
+def test_tenants_are_interleaved_by_finish_tag():
+    scheduler = FairScheduler()
+    for i in range(3):
+        submit(scheduler, 'alice', f'A{i}', 1200)
+    for i in range(3):
+        submit(scheduler, 'bob', f'B{i}', 1200)
+    submit(scheduler, 'carol', 'C0', 900)
+    assert dispatch_order(scheduler) == ['C0', 'A0', 'B0', 'A1', 'B1', 'A2', 'B2']
+
+
+def test_tenant_weights_scale_their_share():
+    scheduler = FairScheduler(weights={'alice': 2.0})
+    for i in range(4):
+        submit(scheduler, 'alice', f'A{i}', 1200)
+        submit(scheduler, 'bob', f'B{i}', 1200)
+    # Alice's jobs advance her virtual time half as fast; ties go to the earlier job
+    assert dispatch_order(scheduler) == ['A0', 'B0', 'A1', 'A2', 'B1', 'A3', 'B2', 'B3']
+
+
+def test_short_recordings_go_first():
+    scheduler = FairScheduler()
+    submit(scheduler, 'alice', 'long0', 3600)
+    submit(scheduler, 'alice', 'long1', 3600)
+    submit(scheduler, 'bob', 'long2', 1800)
+    submit(scheduler, 'bob', 'short0', 120)
+    submit(scheduler, 'alice', 'short1', 600)
+    assert dispatch_order(scheduler)[:2] == ['short0', 'short1']
+
+
+def test_admission_reports_position_and_eta():
+    scheduler = FairScheduler({'max_queued_per_tenant': 2, 'max_queued': 3})
+    submit(scheduler, 'alice', 'A0', 600)
+    submit(scheduler, 'alice', 'A1', 600)
+    with pytest.raises(AdmissionError) as rejected:
+        submit(scheduler, 'alice', 'A2', 600)
+    assert rejected.value.position == 2
+    assert rejected.value.eta == pytest.approx(600)
+
+    submit(scheduler, 'bob', 'B0', 200)
+    with pytest.raises(AdmissionError) as rejected:
+        submit(scheduler, 'carol', 'C0', 600)
+    assert rejected.value.position == 3
+    assert rejected.value.eta == pytest.approx(700)
+
+
+def test_eta_respects_per_user_cap():
+    scheduler = FairScheduler({'workers': 2, 'max_running_per_tenant': 1})
+    jobs = [submit(scheduler, 'alice', f'A{i}', 200) for i in range(3)]
+    # Two workers, but alice's jobs run one at a time
+    assert [scheduler.eta(job) for job in jobs] == pytest.approx([100, 200, 300])
+    assert [scheduler.position(job) for job in jobs] == [1, 2, 3]
+
+    # Another user only waits behind the jobs dispatched before theirs
+    other = submit(scheduler, 'bob', 'B0', 200)
+    assert scheduler.eta(other) == pytest.approx(150)
+
+
+def test_workers_enforce_per_user_cap():
+    scheduler = FairScheduler({'workers': 3, 'max_running_per_tenant': 1})
+    lock = threading.Lock()
+    running = {'alice': 0, 'bob': 0}
+    peak = {'alice': 0, 'bob': 0}
+
+    def work(tenant):
+        with lock:
+            running[tenant] += 1
+            peak[tenant] = max(peak[tenant], running[tenant])
+        time.sleep(0.02)
+        with lock:
+            running[tenant] -= 1
+
+    jobs = [scheduler.submit(tenant, work, tenant, duration=60)
+            for tenant in ('alice', 'bob') for _ in range(4)]
+    scheduler.start()
+    for job in jobs:
+        assert job.wait(5)
+    scheduler.stop()
+    assert all(job.status == 'done' for job in jobs)
+    assert peak == {'alice': 1, 'bob': 1}
+
+
+def test_long_recording_ages_past_a_stream_of_short_ones():
+    scheduler = FairScheduler({'max_normal_wait': 600})
+    submit(scheduler, 'alice', 'long', 7200)
+    for i in range(4):
+        submit(scheduler, f'user{i}', f'short{i}', 60)
+    assert dispatch_order(scheduler) == ['short0', 'short1', 'short2', 'short3', 'long']
+
+    scheduler = FairScheduler({'max_normal_wait': 600})
+    long_job = submit(scheduler, 'alice', 'long', 7200)
+    long_job.submitted_at -= 601
+    for i in range(4):
+        submit(scheduler, f'user{i}', f'short{i}', 60)
+    assert scheduler.position(long_job) == 1
+    assert dispatch_order(scheduler) == ['long', 'short0', 'short1', 'short2', 'short3']
+
+
+@pytest.mark.skipif(shutil.which('ffmpeg') is None or shutil.which('ffprobe') is None,
+                    reason="ffmpeg is not installed")
+def test_duration_of_streamed_webm(tmp_path):
+    # Written to a pipe, like MediaRecorder output, so the header has no duration
+    path = tmp_path / "stream.webm"
+    with open(path, "wb") as f:
+        subprocess.run(['ffmpeg', '-v', 'error', '-f', 'lavfi', '-i', 'sine=duration=3',
+                        '-c:a', 'libopus', '-f', 'webm', 'pipe:1'], stdout=f, check=True)
+    assert media_probe.get_audio_duration(str(path)) == pytest.approx(3.0, abs=0.1)
@@ -0,0 +1,92 @@
+import multiprocessing
+import os
+import sqlite3
+
+import numpy as np
+
+from search_index import SearchIndex, embed_text
+
+
+def meeting(name):
+    """A result whose every document mentions a word unique to the meeting"""
+    return {
+        "segments": [{"speaker": "Speaker 1", "start": float(i), "end": i + 1.0,
+                      "text": f"{name} segment {i} about {name}"} for i in range(3)],
+        "summary": f"Summary of {name}",
+        "bullet_points": [f"{name} decision"],
+        "pdf_path": f"{name}.pdf"
+    }
+
+
+def add_meetings(index_dir, prefix, count):
+    index = SearchIndex(index_dir)
+    for i in range(count):
+        index.add_meeting(f"{prefix}{i}", meeting(f"{prefix}topic{i}"))
+
+
+def assert_vectors_match_documents(index_dir):
+    """Every document's vector row holds the embedding of that document"""
+    index = SearchIndex(index_dir)
+    matrix = index._load_matrix()
+    rows = index._connect().execute("SELECT content, vector_row FROM documents").fetchall()
+    assert len(rows) == len(matrix)
+    for row in rows:
+        assert np.allclose(matrix[row["vector_row"]], embed_text(row["content"])), row["content"]
+
+
+def test_concurrent_writers_keep_vector_rows_aligned(tmp_path):
+    index_dir = str(tmp_path / "index")
+    SearchIndex(index_dir)
+    context = multiprocessing.get_context("spawn")
+    writers = [context.Process(target=add_meetings, args=(index_dir, prefix, 15))
+               for prefix in ("server", "batch")]
+    for writer in writers:
+        writer.start()
+    for writer in writers:
+        writer.join(60)
+        assert writer.exitcode == 0
+
+    index = SearchIndex(index_dir)
+    stats = index.stats()
+    assert stats["meetings"] == 30
+    assert stats["vectors"] == stats["documents"]
+    assert_vectors_match_documents(index_dir)
+    hits = index.search("batchtopic7", limit=3, mode="semantic")
+    assert hits and all(hit["meeting_id"] == "batch7" for hit in hits)
+
+
+def test_partial_append_is_discarded(tmp_path):
+    index_dir = str(tmp_path / "index")
+    index = SearchIndex(index_dir)
+    index.add_meeting("m0", meeting("alphatopic"))
+
+    # A writer that died mid-append leaves part of a row behind
+    with open(index.vectors_path, "ab") as f:
+        f.write(b"\1" * 1000)
+
+    index.add_meeting("m1", meeting("betatopic"))
+    assert index.stats()["vectors"] == index.stats()["documents"]
+    assert_vectors_match_documents(index_dir)
+
+
+def test_meeting_files_survive_schema_upgrade(tmp_path):
+    # An index created before meetings had an archive_path column
+    index_dir = str(tmp_path / "index")
+    os.makedirs(index_dir)
+    conn = sqlite3.connect(os.path.join(index_dir, "meetings.db"))
+    conn.execute("CREATE TABLE meetings (meeting_id TEXT PRIMARY KEY, created_at REAL NOT NULL, "
+                 "pdf_path TEXT)")
+    conn.execute("INSERT INTO meetings VALUES ('old', 0, 'meeting_summary_old.pdf')")
+    conn.commit()
+    conn.close()
+
+    index = SearchIndex(index_dir)
+    result = dict(meeting("gammatopic"), pdf_path="/batch/rec_mp4/bullet_points.pdf",
+                  archive_path="/batch/rec_mp4/transcript.mta")
+    index.add_meeting("batch-id", result)
+
+    assert index.meeting_files("old") == {"pdf_path": "meeting_summary_old.pdf",
+                                          "archive_path": None}
+    assert index.meeting_files("batch-id") == {"pdf_path": "/batch/rec_mp4/bullet_points.pdf",
+                                               "archive_path": "/batch/rec_mp4/transcript.mta"}
+    assert index.meeting_files("missing") is None
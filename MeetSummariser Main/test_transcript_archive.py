@@ -0,0 +1,119 @@
+import pytest
+
+from transcript_archive import TranscriptArchive, write_archive
+
+
+def make_transcript(texts, speakers, words_per_segment=3):
+    """Segments of one-second words, with Whisper-style leading spaces"""
+    segments, words = [], []
+    for i, (text, speaker) in enumerate(zip(texts, speakers)):
+        start = i * words_per_segment
+        segments.append({"id": i, "start": start, "end": start + words_per_segment - 0.2,
+                         "text": text, "speaker": speaker})
+        for j, word in enumerate(text.split()):
+            words.append({"text": f" {word}", "start": start + j, "end": start + j + 0.8,
+                          "segment": i})
+    return segments, words
+
+
+def test_round_trip(tmp_path):
+    segments, words = make_transcript(
+        ["hello there everyone", "shall we start", "yes let's go"],
+        ["Speaker 1", "Speaker 2", "Speaker 1"]
+    )
+    path = write_archive(str(tmp_path / "t.mta"), segments, words, words_per_block=4)
+
+    with TranscriptArchive(path) as archive:
+        assert archive.speakers == ["Speaker 1", "Speaker 2"]
+        assert archive.word_count == len(words)
+        assert archive.block_count == 3
+
+        read_words = archive.words()
+        assert [w["text"] for w in read_words] == [w["text"] for w in words]
+        assert [(w["start"], w["end"]) for w in read_words] == [
+            (round(w["start"], 3), round(w["end"], 3)) for w in words
+        ]
+        assert [w["segment"] for w in read_words] == [w["segment"] for w in words]
+        assert [w["speaker"] for w in read_words] == (
+            ["Speaker 1"] * 3 + ["Speaker 2"] * 3 + ["Speaker 1"] * 3
+        )
+
+        read_segments = archive.segments()
+        assert [s["text"] for s in read_segments] == [s["text"] for s in segments]
+        assert [s["speaker"] for s in read_segments] == [s["speaker"] for s in segments]
+        assert [(s["start"], s["end"]) for s in read_segments] == [
+            (s["start"], round(s["end"], 3)) for s in segments
+        ]
+
+
+def test_empty_transcript(tmp_path):
+    path = write_archive(str(tmp_path / "t.mta"), [], [])
+
+    with TranscriptArchive(path) as archive:
+        assert archive.word_count == 0
+        assert archive.block_count == 0
+        assert archive.speakers == []
+        assert archive.words() == []
+        assert archive.segments() == []
+        assert archive.words(10, 20) == []
+
+
+def test_segments_without_words(tmp_path):
+    segments = [
+        {"id": 0, "start": 0.0, "end": 2.5, "text": "no word timings here", "speaker": "Speaker 1"},
+        {"id": 1, "start": 3.0, "end": 4.0, "text": "nor here", "speaker": "Speaker 2"},
+    ]
+    path = write_archive(str(tmp_path / "t.mta"), segments)
+
+    with TranscriptArchive(path) as archive:
+        assert [s["text"] for s in archive.segments()] == ["no word timings here", "nor here"]
+        # Each segment is stored as a single word spanning the segment
+        assert [(w["text"], w["start"], w["end"], w["speaker"]) for w in archive.words()] == [
+            ("no word timings here", 0.0, 2.5, "Speaker 1"),
+            ("nor here", 3.0, 4.0, "Speaker 2"),
+        ]
+
+
+def test_non_ascii_text(tmp_path):
+    segments, words = make_transcript(
+        ["Grüße aus Köln", "会議 を 始め", "ça va 🎉"],
+        ["Sprecher Ä", "話者 2", "Speaker 1"]
+    )
+    path = write_archive(str(tmp_path / "t.mta"), segments, words, words_per_block=2)
+
+    with TranscriptArchive(path) as archive:
+        assert archive.speakers == ["Sprecher Ä", "話者 2", "Speaker 1"]
+        assert [w["text"] for w in archive.words()] == [w["text"] for w in words]
+        assert [s["text"] for s in archive.segments()] == [s["text"] for s in segments]
+
+
+def test_range_query_across_block_boundary(tmp_path):
+    segments, words = make_transcript(
+        ["one two three", "four five six", "seven eight nine", "ten eleven twelve"],
+        ["Speaker 1", "Speaker 2", "Speaker 1", "Speaker 2"]
+    )
+    path = write_archive(str(tmp_path / "t.mta"), segments, words, words_per_block=4)
+
+    with TranscriptArchive(path) as archive:
+        assert archive.block_count == 3
+        archive._cache.clear()
+
+        # Words 3-5 straddle the boundary between blocks 0 (words 0-3) and 1 (words 4-7)
+        read_words = archive.words(3.5, 5.5)
+        assert [w["text"] for w in read_words] == [" four", " five", " six"]
+        assert sorted(archive._cache) == [0, 1]
+
+
+def test_rejects_other_files(tmp_path):
+    segments, words = make_transcript(["one two three", "four five six"],
+                                      ["Speaker 1", "Speaker 2"])
+    write_archive(str(tmp_path / "t.mta"), segments, words)
+    archive = (tmp_path / "t.mta").read_bytes()
+
+    path = tmp_path / "not-an-archive.mta"
+    # Another file, an empty file, a cut-off header, and archives cut off in
+    # the tables or in the word blocks
+    for data in (b"\0" * 128, b"", archive[:10], archive[:100], archive[:-5]):
+        path.write_bytes(data)
+        with pytest.raises(ValueError):
+            TranscriptArchive(str(path))
@@ -0,0 +1,337 @@
+"""
+Compact binary archive for word-level meeting transcripts.
+
+Layout (little-endian, every section 8-byte aligned):
+
+    header          magic, version, codec, counts and section offsets
+    speaker table   u32 offsets[n + 1] + UTF-8 blob
+    segment table   u32 start_ms[n], u32 end_ms[n], u16 speaker[n],
+                    u32 first_word[n + 1]
+    block index     u64 offset[b], u32 size[b], u32 first_word[b + 1],
+                    u32 start_ms[b], u32 end_ms[b] (running maximum)
+    word blocks     compressed: u32 start_ms[k], u32 end_ms[k],
+                    u32 text_offsets[k + 1] + UTF-8 blob
+
+The tables are read straight out of a memory map, so reading one minute of a
+three hour meeting only decompresses the word blocks that overlap it. Blocks
+are compressed with zstd when the zstandard package is installed, otherwise
+with zlib.
+"""
+import mmap
+import os
+import struct
+import sys
+import zlib
+from bisect import bisect_left, bisect_right
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+MAGIC = b"MTA1"
+VERSION = 1
+CODEC_ZLIB = 1
+CODEC_ZSTD = 2
+
+# magic, version, codec, word/segment/speaker/block counts, duration_ms,
+# speaker table, segment table, block index and data offsets
+HEADER = struct.Struct("<4sHH5I4x4Q")
+WORDS_PER_BLOCK = 512
+
+_LITTLE_ENDIAN = sys.byteorder == 'little'
+
+
+def _ms(seconds):
+    return max(int(round(seconds * 1000)), 0)
+
+
+def _pad(buffer):
+    buffer.extend(b"\0" * (-len(buffer) % 8))
+
+
+def _pack(fmt, values):
+    return struct.pack(f"<{len(values)}{fmt}", *values)
+
+
+def _encode_strings(strings):
+    """Return (offsets, blob) for a string table"""
+    offsets = [0]
+    blob = bytearray()
+    for string in strings:
+        blob.extend(string.encode("utf-8"))
+        offsets.append(len(blob))
+    return offsets, bytes(blob)
+
+
+def _compress(data, codec):
+    if codec == CODEC_ZSTD:
+        return zstandard.ZstdCompressor(level=10).compress(data)
+    return zlib.compress(data, 9)
+
+
+def _decompress(data, codec):
+    if codec == CODEC_ZSTD:
+        if zstandard is None:
+            raise RuntimeError("This transcript archive needs the zstandard package")
+        return zstandard.ZstdDecompressor().decompress(data)
+    return zlib.decompress(data)
+
+
+def write_archive(path, segments, words=None, words_per_block=WORDS_PER_BLOCK):
+    """Write segments (with "speaker" labels) and their words to an archive file
+
+    Each word is a dict with "text", "start", "end" and "segment", the index of
+    its segment in the segments list. Segments without words are stored as a
+    single word holding the segment text.
+    """
+    words_by_segment = [[] for _ in segments]
+    for word in words or []:
+        words_by_segment[word["segment"]].append(word)
+
+    speakers = []
+    for segment in segments:
+        if segment.get("speaker", "") not in speakers:
+            speakers.append(segment.get("speaker", ""))
+
+    # Flatten words in segment order with non-decreasing start times
+    word_start, word_end, word_text = [], [], []
+    seg_start, seg_end, seg_speaker, seg_first_word = [], [], [], []
+    last_start = last_segment_start = 0
+    for segment, segment_words in zip(segments, words_by_segment):
+        if not segment_words:
+            segment_words = [{"text": segment["text"], "start": segment["start"],
+                              "end": segment["end"]}]
+        last_segment_start = max(_ms(segment["start"]), last_segment_start)
+        seg_start.append(last_segment_start)
+        seg_end.append(max(_ms(segment["end"]), last_segment_start))
+        seg_speaker.append(speakers.index(segment.get("speaker", "")))
+        seg_first_word.append(len(word_text))
+        for word in segment_words:
+            last_start = max(_ms(word["start"]), last_start)
+            word_start.append(last_start)
+            word_end.append(max(_ms(word["end"]), last_start))
+            word_text.append(word["text"])
+    seg_first_word.append(len(word_text))
+
+    codec = CODEC_ZSTD if zstandard is not None else CODEC_ZLIB
+
+    body = bytearray()
+    speaker_offset = HEADER.size
+    offsets, blob = _encode_strings(speakers)
+    body.extend(_pack("I", offsets) + blob)
+    _pad(body)
+
+    segment_offset = HEADER.size + len(body)
+    body.extend(_pack("I", seg_start) + _pack("I", seg_end))
+    body.extend(_pack("H", seg_speaker))
+    _pad(body)
+    body.extend(_pack("I", seg_first_word))
+    _pad(body)
+
+    # Compress word blocks first so the block index knows their sizes
+    blocks = []
+    block_first_word, block_start, block_end = [], [], []
+    running_end = 0
+    for first in range(0, len(word_text), words_per_block):
+        last = min(first + words_per_block, len(word_text))
+        offsets, blob = _encode_strings(word_text[first:last])
+        raw = (_pack("I", word_start[first:last]) + _pack("I", word_end[first:last])
+               + _pack("I", offsets) + blob)
+        blocks.append(_compress(raw, codec))
+        running_end = max([running_end] + word_end[first:last])
+        block_first_word.append(first)
+        block_start.append(word_start[first])
+        block_end.append(running_end)
+    block_first_word.append(len(word_text))
+
+    index_offset = HEADER.size + len(body)
+    index_size = 8 * len(blocks) + 4 * len(blocks) + 4 * (len(blocks) + 1) + 8 * len(blocks)
+    index_size += -index_size % 8
+    data_offset = index_offset + index_size
+
+    block_offsets, position = [], data_offset
+    for block in blocks:
+        block_offsets.append(position)
+        position += len(block)
+
+    index = bytearray()
+    index.extend(_pack("Q", block_offsets))
+    index.extend(_pack("I", [len(block) for block in blocks]))
+    index.extend(_pack("I", block_first_word))
+    index.extend(_pack("I", block_start) + _pack("I", block_end))
+    _pad(index)
+
+    header = HEADER.pack(
+        MAGIC, VERSION, codec, len(word_text), len(segments), len(speakers), len(blocks),
+        max(seg_end + word_end + [0]), speaker_offset, segment_offset, index_offset, data_offset
+    )
+
+    with open(path, "wb") as f:
+        f.write(header)
+        f.write(body)
+        f.write(index)
+        for block in blocks:
+            f.write(block)
+    return path
+
+
+class TranscriptArchive:
+    """Memory-mapped reader with random access by timestamp"""
+
+    def __init__(self, path):
+        self._file = open(path, "rb")
+        self._map = None
+        self._view = None
+        self._cache = {}
+        try:
+            self._open(path)
+        except ValueError:
+            self.close()
+            raise
+        except Exception as e:
+            self.close()
+            raise ValueError(f"{path} is a damaged transcript archive: {e}") from e
+
+    def _open(self, path):
+        # mmap cannot map an empty file, and the header must be complete
+        if os.fstat(self._file.fileno()).st_size < HEADER.size:
+            raise ValueError(f"{path} is not a transcript archive")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._map)
+
+        (magic, version, self.codec, self.word_count, self.segment_count, speaker_count,
+         self.block_count, self.duration_ms, speaker_offset, segment_offset, index_offset,
+         data_offset) = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a transcript archive")
+        if data_offset > len(self._map):
+            raise ValueError(f"{path} is truncated")
+
+        offsets = list(self._array(speaker_offset, "I", speaker_count + 1))
+        blob_start = speaker_offset + 4 * (speaker_count + 1)
+        self.speakers = [
+            bytes(self._view[blob_start + offsets[i]:blob_start + offsets[i + 1]]).decode("utf-8")
+            for i in range(speaker_count)
+        ]
+
+        n = self.segment_count
+        self._seg_start = self._array(segment_offset, "I", n)
+        self._seg_end = self._array(segment_offset + 4 * n, "I", n)
+        self._seg_speaker = self._array(segment_offset + 8 * n, "H", n)
+        first_word_offset = segment_offset + 8 * n + 2 * n
+        first_word_offset += -first_word_offset % 8
+        self._seg_first_word = self._array(first_word_offset, "I", n + 1)
+
+        b = self.block_count
+        self._block_offset = self._array(index_offset, "Q", b)
+        self._block_size = self._array(index_offset + 8 * b, "I", b)
+        self._block_first_word = self._array(index_offset + 12 * b, "I", b + 1)
+        self._block_start = self._array(index_offset + 16 * b + 4, "I", b)
+        self._block_end = self._array(index_offset + 20 * b + 4, "I", b)
+        if b and self._block_offset[b - 1] + self._block_size[b - 1] > len(self._map):
+            raise ValueError(f"{path} is truncated")
+
+    def _array(self, offset, fmt, count):
+        """Return a zero-copy view of a little-endian array in the file"""
+        size = struct.calcsize(fmt) * count
+        if _LITTLE_ENDIAN:
+            return self._view[offset:offset + size].cast(fmt)
+        return list(struct.unpack_from(f"<{count}{fmt}", self._map, offset))
+
+    def _block(self, index):
+        """Decompress one word block into (starts, ends, texts)"""
+        if index not in self._cache:
+            offset = self._block_offset[index]
+            raw = _decompress(self._view[offset:offset + self._block_size[index]], self.codec)
+            k = self._block_first_word[index + 1] - self._block_first_word[index]
+            starts = struct.unpack_from(f"<{k}I", raw, 0)
+            ends = struct.unpack_from(f"<{k}I", raw, 4 * k)
+            offsets = struct.unpack_from(f"<{k + 1}I", raw, 8 * k)
+            blob = raw[12 * k + 4:]
+            texts = [blob[offsets[i]:offsets[i + 1]].decode("utf-8") for i in range(k)]
+            if len(self._cache) >= 8:
+                self._cache.pop(next(iter(self._cache)))
+            self._cache[index] = (starts, ends, texts)
+        return self._cache[index]
+
+    def _word_segment(self, word_index):
+        return bisect_right(self._seg_first_word, word_index) - 1
+
+    def words(self, start=0.0, end=None):
+        """Return the words overlapping [start, end) seconds"""
+        start_ms = _ms(start)
+        end_ms = _ms(end) if end is not None else self.duration_ms + 1
+
+        # Block end times are a running maximum, so bisect finds the first candidate
+        words = []
+        for b in range(bisect_right(self._block_end, start_ms), self.block_count):
+            if self._block_start[b] >= end_ms:
+                break
+            starts, ends, texts = self._block(b)
+            first = self._block_first_word[b]
+            for i in range(bisect_left(starts, end_ms)):
+                if ends[i] > start_ms or starts[i] >= start_ms:
+                    segment = self._word_segment(first + i)
+                    words.append({
+                        "text": texts[i],
+                        "start": starts[i] / 1000,
+                        "end": ends[i] / 1000,
+                        "segment": segment,
+                        "speaker": self.speakers[self._seg_speaker[segment]]
+                    })
+        return words
+
+    def segments(self, start=0.0, end=None):
+        """Return the segments overlapping [start, end) seconds with their text"""
+        start_ms = _ms(start)
+        end_ms = _ms(end) if end is not None else self.duration_ms + 1
+
+        segments = []
+        first = max(bisect_right(self._seg_start, start_ms) - 1, 0)
+        for i in range(first, self.segment_count):
+            if self._seg_start[i] >= end_ms:
+                break
+            if self._seg_end[i] <= start_ms and self._seg_start[i] < start_ms:
+                continue
+            segments.append({
+                "id": i,
+                "start": self._seg_start[i] / 1000,
+                "end": self._seg_end[i] / 1000,
+                "speaker": self.speakers[self._seg_speaker[i]],
+                "text": "".join(self._word_texts(self._seg_first_word[i],
+                                                 self._seg_first_word[i + 1])).strip()
+            })
+        return segments
+
+    def _word_texts(self, first, last):
+        texts = []
+        b = bisect_right(self._block_first_word, first) - 1
+        while first < last:
+            block_first = self._block_first_word[b]
+            _, _, block_texts = self._block(b)
+            take = min(last, self._block_first_word[b + 1])
+            texts.extend(block_texts[first - block_first:take - block_first])
+            first = take
+            b += 1
+        return texts
+
+    def close(self):
+        for name in ('_seg_start', '_seg_end', '_seg_speaker', '_seg_first_word',
+                     '_block_offset', '_block_size', '_block_first_word',
+                     '_block_start', '_block_end'):
+            value = getattr(self, name, None)
+            if isinstance(value, memoryview):
+                value.release()
+        self._cache.clear()
+        if self._view is not None:
+            self._view.release()
+        if self._map is not None:
+            self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()